@@ -0,0 +1,38 @@
+import argparse
+import logging
+
+from api.server import make_server
+from db.connection import each_household
+from db.schema import initialize_db, seed_defaults
+from logic.maintenance import start_maintenance_thread
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m api", description="Local JSON API for chores and wallets")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--maintenance", action="store_true",
+        help="Also run the overnight maintenance thread (when the Streamlit app is not running)",
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    for _ in each_household():
+        initialize_db()
+        seed_defaults()
+    if args.maintenance:
+        start_maintenance_thread()
+
+    server = make_server(args.host, args.port)
+    print(f"Serving on http://{args.host}:{server.server_port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
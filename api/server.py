@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from datetime import date, timedelta
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from db.connection import HOUSEHOLDS_DIR, household_db_path, use_household
+from db.queries.children import list_children
+from db.queries.chore_instances import SWEEP_WATERMARK_KEY, get_instance, get_instances_for_date
+from db.queries.settings import get_setting
+from db.queries.wallets import get_wallet_summaries
+from logic.auth import verify_pin
+from logic.wallet import approve_by_parent, mark_done_by_child, mark_occurrence_done
+
+logger = logging.getLogger(__name__)
+
+# Header carrying the parent PIN for parent-only actions.
+PIN_HEADER = "X-Chores-Pin"
+
+# Request bodies are not used. Up to this many bytes are read and discarded so
+# the connection can be reused; a larger body closes the connection instead.
+_MAX_DRAIN_BYTES = 64 * 1024
+
+# Failed PIN attempts per client address. After _PIN_FREE_FAILURES in a row a
+# client is locked out, for _PIN_LOCKOUT_SECONDS doubling with each further
+# failure up to _PIN_MAX_LOCKOUT_SECONDS. A correct PIN clears the count.
+_PIN_FREE_FAILURES = 5
+_PIN_LOCKOUT_SECONDS = 30
+_PIN_MAX_LOCKOUT_SECONDS = 15 * 60
+
+_pin_failures: dict[str, tuple[int, float]] = {}  # address -> (failures, locked until)
+_pin_lock = threading.Lock()
+
+
+class ApiError(Exception):
+    def __init__(self, status: HTTPStatus, message: str, headers: dict | None = None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+def _row(row) -> dict | None:
+    return dict(row) if row is not None else None
+
+
+def _parse_date(value: str | None) -> str:
+    if value is None:
+        return date.today().isoformat()
+    try:
+        return date.fromisoformat(value).isoformat()
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"Invalid date {value!r}, expected YYYY-MM-DD")
+
+
+def _optional_int(value: str | None, name: str) -> int | None:
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"{name} must be an integer")
+
+
+def _done_result(done: bool, instance_id: int | None) -> dict:
+    instance = get_instance(instance_id) if instance_id is not None else None
+    if instance is None:
+        raise ApiError(HTTPStatus.NOT_FOUND, "No such chore instance")
+    if not done:
+        raise ApiError(HTTPStatus.CONFLICT, f"Chore is {instance['status']}, not pending")
+    return _row(instance)
+
+
+# Handlers take (request handler, path match, query params) and return a JSON-able result.
+
+def _health(request, match, query):
+    return {"status": "ok"}
+
+
+def _instances(request, match, query):
+    """A day's instances. Upcoming occurrences without a row have "id": null and
+    are marked done through /chores/<chore_id>/occurrences/<date>/done."""
+    rows = get_instances_for_date(
+        _parse_date(query.get("date")), _optional_int(query.get("child_id"), "child_id")
+    )
+    return [dict(row) for row in rows]
+
+
+def _mark_done(request, match, query):
+    instance_id = int(match["instance_id"])
+    return _done_result(mark_done_by_child(instance_id), instance_id)
+
+
+def _mark_occurrence_done(request, match, query):
+    chore_id, scheduled_date = int(match["chore_id"]), _parse_date(match["date"])
+    watermark = get_setting(SWEEP_WATERMARK_KEY) or ""
+    if scheduled_date < watermark:
+        raise ApiError(HTTPStatus.CONFLICT, f"Chores before {watermark} have already been marked missed")
+    done = mark_occurrence_done(chore_id, scheduled_date)
+    instance = next(
+        (i for i in get_instances_for_date(scheduled_date) if i["chore_id"] == chore_id), None
+    )
+    return _done_result(done, instance["id"] if instance else None)
+
+
+def _check_pin(request) -> None:
+    """Verify the parent PIN, throttling clients that keep getting it wrong."""
+    address = request.client_address[0]
+    # Held across the check so parallel connections cannot race past a lockout.
+    with _pin_lock:
+        now = time.monotonic()
+        failures, locked_until = _pin_failures.get(address, (0, 0.0))
+        if now < locked_until:
+            retry_after = str(int(locked_until - now) + 1)
+            raise ApiError(
+                HTTPStatus.TOO_MANY_REQUESTS,
+                f"Too many wrong PINs; try again in {retry_after} seconds",
+                {"Retry-After": retry_after},
+            )
+        if verify_pin(request.headers.get(PIN_HEADER, "")):
+            _pin_failures.pop(address, None)
+            return
+        failures += 1
+        if failures >= _PIN_FREE_FAILURES:
+            lockout = _PIN_LOCKOUT_SECONDS * 2 ** (failures - _PIN_FREE_FAILURES)
+            locked_until = now + min(lockout, _PIN_MAX_LOCKOUT_SECONDS)
+            logger.warning("Locking out %s after %d wrong PINs", address, failures)
+        _pin_failures[address] = (failures, locked_until)
+    raise ApiError(HTTPStatus.UNAUTHORIZED, f"Parent PIN required in {PIN_HEADER}")
+
+
+def _approve(request, match, query):
+    _check_pin(request)
+    instance_id = int(match["instance_id"])
+    approved = approve_by_parent(instance_id)
+    instance = get_instance(instance_id)
+    if instance is None:
+        raise ApiError(HTTPStatus.NOT_FOUND, "No such chore instance")
+    if not approved:
+        raise ApiError(HTTPStatus.CONFLICT, f"Chore is {instance['status']}, not awaiting approval")
+    return _row(instance)
+
+
+def _balances(request, match, query):
+    children = list_children()
+    today = date.today()
+    week_start = (today - timedelta(days=today.weekday())).isoformat()
+    summaries = get_wallet_summaries([c["id"] for c in children], week_start)
+    return [
+        {
+            "child_id": c["id"],
+            "name": c["name"],
+            "monetary": summaries[c["id"]]["monetary"],
+            "screen_time": summaries[c["id"]]["screen_time"],
+        }
+        for c in children
+    ]
+
+
+_ROUTES = [
+    ("GET", re.compile(r"/health"), _health),
+    ("GET", re.compile(r"/instances"), _instances),
+    ("POST", re.compile(r"/instances/(?P<instance_id>\d+)/done"), _mark_done),
+    ("POST", re.compile(r"/chores/(?P<chore_id>\d+)/occurrences/(?P<date>[\d-]+)/done"), _mark_occurrence_done),
+    ("POST", re.compile(r"/instances/(?P<instance_id>\d+)/approve"), _approve),
+    ("GET", re.compile(r"/balances"), _balances),
+]
+
+
+class ChoresRequestHandler(BaseHTTPRequestHandler):
+    # Keep-alive, so a display polling every few seconds reuses its socket.
+    # Headers and body are separate writes; without TCP_NODELAY each response
+    # on a kept-alive socket stalls ~40 ms on delayed ACKs.
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server_version = "ChoresAPI"
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def _dispatch(self, method: str) -> None:
+        url = urlsplit(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            if method == "POST":
+                self._drain_body()
+            for route_method, pattern, handler in _ROUTES:
+                match = pattern.fullmatch(url.path.rstrip("/") or "/")
+                if match and route_method == method:
+                    with use_household(_household(query)):
+                        self._send(HTTPStatus.OK, handler(self, match, query))
+                    return
+            raise ApiError(HTTPStatus.NOT_FOUND, f"No route for {method} {url.path}")
+        except ApiError as e:
+            self._send(e.status, {"error": str(e)}, e.headers)
+        except Exception:
+            logger.exception("Error handling %s %s", method, self.path)
+            self._send(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Internal error"})
+
+    def _drain_body(self) -> None:
+        value = self.headers.get("Content-Length") or "0"
+        length = int(value) if value.isdigit() else -1
+        if length < 0:
+            # Where the body ends is unknown, so the connection cannot be reused.
+            self.close_connection = True
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Content-Length must be a non-negative integer")
+        if length > _MAX_DRAIN_BYTES:
+            self.close_connection = True
+        elif length:
+            self.rfile.read(length)
+
+    def _send(self, status: HTTPStatus, payload, headers: dict | None = None) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+def _household(query: dict) -> str | None:
+    """The ?household= a request is for; required when households are configured."""
+    if not HOUSEHOLDS_DIR:
+        return None
+    household = query.get("household")
+    try:
+        known = household is not None and os.path.exists(household_db_path(household))
+    except ValueError:
+        known = False
+    if not known:
+        raise ApiError(HTTPStatus.NOT_FOUND, "Unknown or missing ?household=")
+    return household
+
+
+def make_server(host: str, port: int) -> ThreadingHTTPServer:
+    """A server that handles each client connection on its own thread."""
+    server = ThreadingHTTPServer((host, port), ChoresRequestHandler)
+    server.daemon_threads = True
+    return server
@@ -1,10 +1,10 @@
 import streamlit as st
-from datetime import date, timedelta
 
+from db.connection import each_household, profile_queries, use_household
 from db.schema import initialize_db, seed_defaults
-from db.queries.chore_instances import sweep_missed_chores
-from logic.recurrence import ensure_instances_for_window
-from ui.auth_gate import render_auth_gate
+from logic.maintenance import start_maintenance_thread
+from ui.auth_gate import render_auth_gate, render_household_picker
+from ui.render_timing import render_span
 
 
 _MOBILE_CSS = """
@@ -107,16 +107,14 @@ def _inject_mobile_css():
     st.markdown(_MOBILE_CSS, unsafe_allow_html=True)
 
 
+@st.cache_resource(show_spinner=False)
 def _bootstrap():
-    """Run once per session: DB init, sweep missed chores, expand instances."""
-    if st.session_state.get("_bootstrapped"):
-        return
-    initialize_db()
-    seed_defaults()
-    today = date.today()
-    sweep_missed_chores(today.isoformat())
-    ensure_instances_for_window(today - timedelta(days=14), today + timedelta(days=30))
-    st.session_state["_bootstrapped"] = True
+    """Run once per process: init every household's DB, then start the background maintenance thread."""
+    for _ in each_household():
+        initialize_db()
+        seed_defaults()
+    start_maintenance_thread()
+    return True
 
 
 def _render_parent_app():
@@ -124,49 +122,49 @@ def _render_parent_app():
     from ui.parent.chore_manager import render_chore_manager
     from ui.parent.child_manager import render_child_manager
     from ui.parent.settings import render_parent_settings
+    from ui.parent.calendar import render_parent_calendar
 
     st.title("Parent Dashboard")
 
-    tab_approvals, tab_chores, tab_children, tab_settings = st.tabs(
-        ["Approvals", "Chores", "Children", "Settings"]
+    tab_approvals, tab_calendar, tab_chores, tab_children, tab_settings = st.tabs(
+        ["Approvals", "Calendar", "Chores", "Children", "Settings"]
     )
 
-    with tab_approvals:
+    with tab_approvals, render_span("parent/approvals"):
         render_parent_dashboard()
 
-    with tab_chores:
+    with tab_calendar, render_span("parent/calendar"):
+        render_parent_calendar()
+
+    with tab_chores, render_span("parent/chores"):
         render_chore_manager()
 
-    with tab_children:
+    with tab_children, render_span("parent/children"):
         render_child_manager()
 
-    with tab_settings:
+    with tab_settings, render_span("parent/settings"):
         render_parent_settings()
 
 
 def _render_child_app(child_id: int):
     from ui.child.dashboard import render_child_dashboard
     from ui.child.chore_add import render_chore_add
+    from ui.wallet_history import render_transaction_history
 
-    tab_home, tab_add = st.tabs(["My Chores", "Add a Chore"])
+    tab_home, tab_wallet, tab_add = st.tabs(["My Chores", "My Wallet", "Add a Chore"])
 
-    with tab_home:
+    with tab_home, render_span("child/my_chores"):
         render_child_dashboard(child_id)
 
-    with tab_add:
+    with tab_wallet, render_span("child/wallet"):
+        st.header("My Wallet")
+        render_transaction_history(child_id, key="child_wallet")
+
+    with tab_add, render_span("child/add_chore"):
         render_chore_add(child_id)
 
 
-def main():
-    st.set_page_config(
-        page_title="Family Chores",
-        page_icon="✅",
-        layout="wide",
-        initial_sidebar_state="expanded",
-    )
-
-    _inject_mobile_css()
-    _bootstrap()
+def _render_for_role():
     render_auth_gate()
 
     role = st.session_state.get("role")
@@ -179,14 +177,37 @@ def main():
         return
 
     if role == "parent":
-        _render_parent_app()
+        with render_span("parent"):
+            _render_parent_app()
     elif role == "child":
         child_id = st.session_state.get("child_id")
         if child_id:
-            _render_child_app(child_id)
+            with render_span("child"):
+                _render_child_app(child_id)
         else:
             st.error("No child selected.")
 
 
+def main():
+    st.set_page_config(
+        page_title="Family Chores",
+        page_icon="✅",
+        layout="wide",
+        initial_sidebar_state="expanded",
+    )
+
+    _inject_mobile_css()
+    _bootstrap()
+
+    # Statements issued during this rerun, shown under Parent → Settings on
+    # the next one when SQL profiling is enabled.
+    with profile_queries() as queries:
+        try:
+            with use_household(render_household_picker()):
+                _render_for_role()
+        finally:
+            st.session_state["_last_rerun_queries"] = queries
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,64 @@
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import sys
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m bench", description="Synthetic data and benchmarks")
+    parser.add_argument("--db", default="bench.db", help="Database file to generate or benchmark (default: bench.db)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    dataset = argparse.ArgumentParser(add_help=False)
+    dataset.add_argument("--children", type=int, default=4)
+    dataset.add_argument("--chores", type=int, default=10, help="Chores per child")
+    dataset.add_argument("--years", type=float, default=2.0, help="Years of history")
+    dataset.add_argument("--seed", type=int, default=0)
+
+    sub.add_parser("generate", parents=[dataset], help="Create a synthetic household database")
+    run = sub.add_parser(
+        "run", parents=[dataset],
+        help="Time queries and logic against the database, generating it first if missing",
+    )
+    run.add_argument("--repeat", type=int, default=5, help="Timed runs per benchmark")
+    run.add_argument("--only", action="append", help="Run only benchmarks whose name contains this")
+    run.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    if args.command == "generate" and os.path.exists(args.db):
+        parser.error(f"{args.db} already exists")
+
+    # The database path is read when db.connection is first imported.
+    os.environ["CHORES_DB_PATH"] = args.db
+    from bench.generate import generate_household, table_sizes
+    from bench.suite import run_suite
+    from db.schema import initialize_db
+
+    if not os.path.exists(args.db):
+        print(f"Generating {args.db}...", file=sys.stderr)
+        generate_household(args.children, args.chores, args.years, args.seed)
+    if args.command == "generate":
+        print(json.dumps(table_sizes()))
+        return
+
+    initialize_db()
+    report = {
+        "db": args.db,
+        "db_bytes": os.path.getsize(args.db),
+        "tables": table_sizes(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "results": run_suite(repeat=args.repeat, only=args.only),
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import json
+import random
+from datetime import date, timedelta
+from itertools import islice
+from typing import Iterator
+
+from db.connection import get_connection
+from db.schema import initialize_db, seed_defaults
+from logic.maintenance import run_maintenance
+from logic.recurrence import iter_chore_dates, weekday_calendar
+
+_CHUNK_SIZE = 5000
+
+# Share of past occurrences that were approved; the rest were missed.
+_APPROVED_RATE = 0.85
+# Share of today's occurrences already marked done and awaiting approval.
+_AWAITING_APPROVAL_RATE = 0.3
+
+_TITLES = [
+    "Dishes", "Trash", "Make bed", "Feed the cat", "Vacuum", "Homework",
+    "Laundry", "Water plants", "Set the table", "Tidy room", "Walk the dog",
+    "Practice piano",
+]
+
+
+def generate_household(
+    children: int = 4,
+    chores_per_child: int = 10,
+    years: float = 2.0,
+    seed: int = 0,
+    today: date | None = None,
+) -> dict:
+    """Fill the configured database with a synthetic household.
+
+    Every chore starts `years` before `today` and has a settled instance for
+    each past occurrence, with ledger credits for the approved ones. The
+    regular maintenance pass then sweeps, finalizes past weeks and archives,
+    leaving the database as a long-running install would be. Returns the
+    resulting table sizes.
+    """
+    today = today or date.today()
+    rng = random.Random(seed)
+    history_start = today - timedelta(days=int(years * 365))
+
+    initialize_db()
+    seed_defaults()
+    with get_connection() as conn:
+        child_ids = []
+        for n in range(children):
+            cur = conn.execute(
+                "INSERT INTO children (name, weekly_allowance_budget) VALUES (?, ?)",
+                (f"Child {n + 1}", float(rng.choice([5, 10, 15, 20]))),
+            )
+            child_ids.append(cur.lastrowid)
+
+        conn.executemany(
+            """
+            INSERT INTO chores (
+                title, assigned_to, created_by_role, recurrence_type, recurrence_days,
+                start_date, allowance_type, fixed_amount, chore_weight,
+                screen_time_hours
+            ) VALUES (
+                :title, :assigned_to, 'parent', :recurrence_type, :recurrence_days,
+                :start_date, :allowance_type, :fixed_amount, :chore_weight,
+                :screen_time_hours
+            )
+            """,
+            [
+                _random_chore(rng, child_id, history_start, today)
+                for child_id in child_ids
+                for _ in range(chores_per_child)
+            ],
+        )
+        chores = conn.execute("SELECT * FROM chores").fetchall()
+
+        rows = _instance_rows(rng, chores, history_start, today)
+        while True:
+            chunk = list(islice(rows, _CHUNK_SIZE))
+            if not chunk:
+                break
+            conn.executemany(
+                """
+                INSERT INTO chore_instances
+                    (chore_id, scheduled_date, status, completed_at, approved_at, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                chunk,
+            )
+
+        # Credit approved instances in approval order, as the app would have.
+        conn.execute(
+            """
+            INSERT INTO wallet_transactions
+                (child_id, chore_instance_id, transaction_type, amount, note, created_at)
+            SELECT child_id, instance_id, transaction_type, amount, note, approved_at
+            FROM (
+                SELECT c.assigned_to AS child_id, ci.id AS instance_id,
+                       'monetary' AS transaction_type, c.fixed_amount AS amount,
+                       'Fixed allowance for: ' || c.title AS note, ci.approved_at
+                FROM chore_instances ci JOIN chores c ON ci.chore_id = c.id
+                WHERE ci.status = 'approved'
+                  AND c.allowance_type IN ('fixed', 'both') AND c.fixed_amount > 0
+                UNION ALL
+                SELECT c.assigned_to, ci.id, 'screen_time', c.screen_time_hours,
+                       'Screen time for: ' || c.title, ci.approved_at
+                FROM chore_instances ci JOIN chores c ON ci.chore_id = c.id
+                WHERE ci.status = 'approved' AND c.screen_time_hours > 0
+            )
+            ORDER BY approved_at, instance_id
+            """
+        )
+
+    run_maintenance(today)
+    return table_sizes()
+
+
+def table_sizes() -> dict:
+    with get_connection() as conn:
+        return {
+            table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in (
+                "children", "chores", "chore_instances", "chore_instances_archive",
+                "wallet_transactions", "weekly_allowance_snapshots",
+            )
+        }
+
+
+def _random_chore(rng: random.Random, child_id: int, history_start: date, today: date) -> dict:
+    recurrence_type = rng.choices(["daily", "weekly", "once"], weights=[6, 3, 1])[0]
+    if recurrence_type == "daily":
+        days = sorted(rng.sample(range(7), rng.randint(3, 7)))
+        start = history_start
+    elif recurrence_type == "weekly":
+        days = [rng.randrange(7)]
+        start = history_start
+    else:
+        days = None
+        start = history_start + timedelta(days=rng.randrange((today - history_start).days))
+    allowance_type = rng.choices(["fixed", "weighted", "both", None], weights=[4, 3, 2, 1])[0]
+    return {
+        "title": rng.choice(_TITLES),
+        "assigned_to": child_id,
+        "recurrence_type": recurrence_type,
+        "recurrence_days": json.dumps(days) if days is not None else None,
+        "start_date": start.isoformat(),
+        "allowance_type": allowance_type,
+        "fixed_amount": (
+            rng.choice([0.25, 0.5, 1.0, 2.0]) if allowance_type in ("fixed", "both") else None
+        ),
+        "chore_weight": (
+            float(rng.randint(1, 5)) if allowance_type in ("weighted", "both") else None
+        ),
+        "screen_time_hours": rng.choice([0.0, 0.0, 15.0, 30.0]),
+    }
+
+
+def _instance_rows(
+    rng: random.Random, chores, history_start: date, today: date
+) -> Iterator[tuple]:
+    calendar = weekday_calendar(history_start, today)
+    today_iso = today.isoformat()
+    for chore in chores:
+        for day in iter_chore_dates(chore, history_start, today, calendar):
+            created_at = f"{day} 07:00:00"
+            if day == today_iso:
+                if rng.random() < _AWAITING_APPROVAL_RATE:
+                    yield (chore["id"], day, "completed_pending_approval",
+                           f"{day} 17:00:00", None, created_at)
+            elif rng.random() < _APPROVED_RATE:
+                yield (chore["id"], day, "approved",
+                       f"{day} 17:00:00", f"{day} 20:00:00", created_at)
+            else:
+                yield (chore["id"], day, "missed", None, None, created_at)
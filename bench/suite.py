@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import contextlib
+import statistics
+import time
+from datetime import date, timedelta
+from typing import Callable
+
+from db.connection import get_connection
+from db.queries.children import list_children
+from db.queries.chore_instances import (
+    archive_settled_instances,
+    get_instances_for_date,
+    get_instances_for_week,
+    get_pending_approvals,
+    get_status_counts_for_range,
+    sweep_missed_chores,
+)
+from db.queries.wallets import (
+    get_balance,
+    get_balance_as_of,
+    get_transactions_page,
+    get_wallet_summaries,
+)
+from logic.allowance import finalize_week, finalize_week_all
+
+
+class _Rollback(Exception):
+    pass
+
+
+@contextlib.contextmanager
+def _rolled_back():
+    """Run the block in a write transaction that is always rolled back, so
+    benchmarks that write measure the same work on every run."""
+    try:
+        with get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            yield
+            raise _Rollback
+    except _Rollback:
+        pass
+
+
+def _uncached(fn: Callable) -> Callable:
+    return getattr(fn, "uncached", fn)
+
+
+def _benchmarks(today: date) -> list[tuple[str, bool, Callable[[], object]]]:
+    """(name, writes, fn) for each benchmark. Cached reads are timed without
+    the cache, so results reflect the query itself."""
+    children = list_children()
+    child_id = children[0]["id"]
+    child_ids = [c["id"] for c in children]
+    ws = today - timedelta(days=today.weekday())
+    week_start, week_end = ws.isoformat(), (ws + timedelta(days=6)).isoformat()
+    month_start = today.replace(day=1).isoformat()
+    month_end = (today.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+    year_ago = f"{today - timedelta(days=365)} 00:00:00"
+
+    return [
+        ("get_instances_for_date", False,
+         lambda: get_instances_for_date(today.isoformat())),
+        ("get_instances_for_week", False,
+         lambda: _uncached(get_instances_for_week)(week_start, week_end)),
+        ("get_instances_for_week[child]", False,
+         lambda: _uncached(get_instances_for_week)(week_start, week_end, child_id=child_id)),
+        ("get_status_counts_for_range[month]", False,
+         lambda: _uncached(get_status_counts_for_range)(month_start, month_end.isoformat())),
+        ("get_pending_approvals", False, get_pending_approvals),
+        ("get_balance", False,
+         lambda: _uncached(get_balance)(child_id, "monetary")),
+        ("get_wallet_summaries", False,
+         lambda: _uncached(get_wallet_summaries)(child_ids, week_start)),
+        ("get_balance_as_of[1y]", False,
+         lambda: get_balance_as_of(child_id, "monetary", year_ago)),
+        ("get_transactions_page", False,
+         lambda: get_transactions_page(child_id)),
+        ("sweep_missed_chores[1d]", True,
+         lambda: sweep_missed_chores((today + timedelta(days=1)).isoformat())),
+        ("finalize_week", True,
+         lambda: finalize_week(child_id, week_start, week_end)),
+        ("finalize_week_all", True,
+         lambda: finalize_week_all(week_start)),
+        ("archive_settled_instances[90d]", True,
+         lambda: archive_settled_instances((today - timedelta(days=90)).isoformat())),
+    ]
+
+
+def run_suite(repeat: int = 5, today: date | None = None, only: list[str] | None = None) -> list[dict]:
+    """Time each benchmark `repeat` times after one warm-up run."""
+    results = []
+    for name, writes, fn in _benchmarks(today or date.today()):
+        if only and not any(pattern in name for pattern in only):
+            continue
+        timings = []
+        for _ in range(repeat + 1):
+            started = time.perf_counter()
+            if writes:
+                with _rolled_back():
+                    fn()
+            else:
+                fn()
+            timings.append((time.perf_counter() - started) * 1000)
+        timings = timings[1:]
+        results.append({
+            "name": name,
+            "runs": repeat,
+            "min_ms": round(min(timings), 3),
+            "median_ms": round(statistics.median(timings), 3),
+            "max_ms": round(max(timings), 3),
+        })
+    return results
@@ -0,0 +1,51 @@
+import argparse
+import os
+
+from db.connection import HOUSEHOLDS_DIR, each_household, household_db_path, use_household
+from db.schema import initialize_db, seed_defaults
+from db.queries.wallets import rebuild_wallet_balances
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m db", description="Database maintenance commands")
+    parser.add_argument(
+        "--household",
+        help="Only this household's database (created if missing); default is every household",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("migrate", help="Create tables and apply pending schema migrations")
+    sub.add_parser("rebuild-balances", help="Recompute wallet_balances and wallet_checkpoints from wallet_transactions")
+    args = parser.parse_args(argv)
+
+    if args.household:
+        if not HOUSEHOLDS_DIR:
+            parser.error("--household requires CHORES_HOUSEHOLDS_DIR to be set")
+        try:
+            household_db_path(args.household)
+        except ValueError as e:
+            parser.error(str(e))
+        os.makedirs(HOUSEHOLDS_DIR, exist_ok=True)
+        with use_household(args.household):
+            _run(args.command, args.household)
+    else:
+        households = 0
+        for household in each_household():
+            _run(args.command, household)
+            households += 1
+        if not households:
+            print(f"No households in {HOUSEHOLDS_DIR}; create one with --household NAME.")
+
+
+def _run(command: str, household: str | None) -> None:
+    prefix = f"[{household}] " if household else ""
+    initialize_db()
+    seed_defaults()
+    if command == "rebuild-balances":
+        rows = rebuild_wallet_balances()
+        print(f"{prefix}Rebuilt {rows} wallet balance rows.")
+    elif command == "migrate":
+        print(f"{prefix}Schema is up to date.")
+
+
+if __name__ == "__main__":
+    main()
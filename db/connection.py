@@ -1,20 +1,342 @@
+from __future__ import annotations
+
 import sqlite3
 import os
 import contextlib
+import re
+import sys
+import threading
+import time
 
 DB_PATH = os.getenv("CHORES_DB_PATH", "chores.db")
 
+# When set, each household (family) has its own database file in this
+# directory, named <household>.db, so one family's writes never block
+# another's reads. Otherwise everything lives in DB_PATH.
+HOUSEHOLDS_DIR = os.getenv("CHORES_HOUSEHOLDS_DIR")
+_HOUSEHOLD_NAME = re.compile(r"[a-z0-9][a-z0-9_-]{0,63}")
+
+# Connections are opened once per database file and reused for the life of the
+# process. Each thread checks one out for the duration of a `get_connection()`
+# block; nested blocks on the same thread share it, so only the outermost block
+# commits.
+_POOL_MAX_IDLE = 8
+_CACHE_SIZE_KB = 16 * 1024
+_MMAP_SIZE = 128 * 1024 * 1024
+
+_local = threading.local()
+
+
+class _Shard:
+    """The connection pool and change probe for one database file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.pool: list[sqlite3.Connection] = []
+        self.pool_lock = threading.Lock()
+        # A dedicated connection whose PRAGMA data_version changes whenever any
+        # other connection (pooled, or in another process) commits to the file.
+        self.probe: sqlite3.Connection | None = None
+        self.probe_lock = threading.Lock()
+
+    def take_idle(self) -> list[sqlite3.Connection]:
+        with self.pool_lock:
+            idle = list(self.pool)
+            self.pool.clear()
+        return idle
+
+
+_shards: dict[str, _Shard] = {}
+_shards_lock = threading.Lock()
+
+
+def _current_shard() -> _Shard:
+    path = current_db_path()
+    shard = _shards.get(path)
+    if shard is None:
+        with _shards_lock:
+            shard = _shards.setdefault(path, _Shard(path))
+    return shard
+
+
+def list_households() -> list[str]:
+    """Households with a database file, or [] when HOUSEHOLDS_DIR is not set."""
+    if not HOUSEHOLDS_DIR or not os.path.isdir(HOUSEHOLDS_DIR):
+        return []
+    return sorted(
+        name[:-3]
+        for name in os.listdir(HOUSEHOLDS_DIR)
+        if name.endswith(".db") and _HOUSEHOLD_NAME.fullmatch(name[:-3])
+    )
+
+
+def household_db_path(household: str | None) -> str:
+    if household is None:
+        return DB_PATH
+    if not HOUSEHOLDS_DIR:
+        raise ValueError("CHORES_HOUSEHOLDS_DIR is not set")
+    if not _HOUSEHOLD_NAME.fullmatch(household):
+        raise ValueError(
+            f"Invalid household name {household!r}: use lowercase letters, digits, '-' and '_'"
+        )
+    return os.path.join(HOUSEHOLDS_DIR, f"{household}.db")
+
+
+def current_db_path() -> str:
+    return getattr(_local, "db_path", None) or DB_PATH
+
 
 @contextlib.contextmanager
-def get_connection():
-    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+def use_household(household: str | None):
+    """Route this thread's database access to `household`'s file inside the block.
+
+    None selects DB_PATH. A household's file is created on first use.
+    """
+    if in_transaction():
+        raise RuntimeError("Cannot switch households inside a transaction")
+    previous = getattr(_local, "db_path", None)
+    _local.db_path = household_db_path(household)
+    try:
+        yield
+    finally:
+        _local.db_path = previous
+
+
+def each_household():
+    """Yield each household with its database selected, or None once when
+    households are not configured. Yields nothing if HOUSEHOLDS_DIR is set but
+    has no households, rather than falling back to DB_PATH."""
+    for household in list_households() if HOUSEHOLDS_DIR else [None]:
+        with use_household(household):
+            yield household
+
+
+# Statement profiling. Connections are opened as _ProfiledConnection only while
+# it is enabled, so plain connections carry no tracing or timing overhead.
+_profiling = os.getenv("CHORES_PROFILE_SQL") == "1"
+
+
+class _ProfiledCursor(sqlite3.Cursor):
+    """Times execute and fetch calls, charging them to one record per execute."""
+
+    _record = None
+
+    def execute(self, sql, parameters=()):
+        self._record = _start_record(sql)
+        self._timed(super().execute, sql, parameters)
+        if self._record is not None and self.rowcount > 0:
+            self._record["rows"] = self.rowcount
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        self._record = _start_record(sql)
+        self._timed(super().executemany, sql, seq_of_parameters)
+        if self._record is not None and self.rowcount > 0:
+            self._record["rows"] = self.rowcount
+        return self
+
+    def fetchone(self):
+        row = self._timed(super().fetchone)
+        if row is not None and self._record is not None:
+            self._record["rows"] += 1
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._timed(super().fetchmany, self.arraysize if size is None else size)
+        if self._record is not None:
+            self._record["rows"] += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._timed(super().fetchall)
+        if self._record is not None:
+            self._record["rows"] += len(rows)
+        return rows
+
+    def _timed(self, fn, *args):
+        record = self._record
+        if record is None:
+            return fn(*args)
+        _local.record = record
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            record["ms"] += (time.perf_counter() - started) * 1000
+            _local.record = None
+
+
+class _ProfiledConnection(sqlite3.Connection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.set_trace_callback(_on_statement)
+
+    def cursor(self, factory=_ProfiledCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def commit(self):
+        record = _start_record("COMMIT") if self.in_transaction else None
+        if record is None:
+            return super().commit()
+        started = time.perf_counter()
+        try:
+            return super().commit()
+        finally:
+            record["ms"] += (time.perf_counter() - started) * 1000
+
+
+def _start_record(sql: str) -> dict | None:
+    records = getattr(_local, "profile", None)
+    if records is None:
+        return None
+    record = {"sql": " ".join(sql.split()), "caller": _caller(), "ms": 0.0, "rows": 0, "statements": 0, "bound": False}
+    records.append(record)
+    return record
+
+
+def _on_statement(sql: str) -> None:
+    # SQLite reports each statement it runs, with bound values filled in,
+    # including those run by triggers and once per executemany() row.
+    record = getattr(_local, "record", None)
+    if record is not None:
+        record["statements"] += 1
+        text = " ".join(sql.split())
+        # Show the issued statement with its values bound, rather than an
+        # implicit BEGIN or a statement run inside a trigger.
+        if not record["bound"] and text.split(" ", 1)[0].upper() == record["sql"].split(" ", 1)[0].upper():
+            record["sql"] = text
+            record["bound"] = True
+
+
+def _caller() -> str:
+    """The db.* function that issued the statement, else the nearest caller."""
+    frame = sys._getframe(2)
+    fallback = None
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module == __name__ and frame.f_code.co_name == "_open_connection":
+            return "connection.open"
+        if module not in (__name__, "db.queries.cache", "contextlib"):
+            name = f"{module.rsplit('.', 1)[-1]}.{frame.f_code.co_name}"
+            if module.startswith("db."):
+                return name
+            fallback = fallback or name
+        frame = frame.f_back
+    return fallback or "?"
+
+
+def is_profiling() -> bool:
+    return _profiling
+
+
+def set_profiling(enabled: bool) -> None:
+    """Turn statement profiling on or off for connections opened from now on."""
+    global _profiling
+    _profiling = enabled
+    for shard in list(_shards.values()):
+        for conn in shard.take_idle():
+            conn.close()
+
+
+@contextlib.contextmanager
+def profile_queries():
+    """Collect a record of each statement this thread runs inside the block.
+
+    Yields a list that fills with dicts: sql (with values filled in when
+    `bound`), the calling function, ms, rows, and the number of statements
+    SQLite ran for it. It stays empty unless profiling is enabled.
+    """
+    records: list[dict] = []
+    previous = getattr(_local, "profile", None)
+    _local.profile = records
+    try:
+        yield records
+    finally:
+        _local.profile = previous
+
+
+def _open_connection(path: str) -> sqlite3.Connection:
+    factory = _ProfiledConnection if _profiling else sqlite3.Connection
+    conn = sqlite3.connect(path, check_same_thread=False, timeout=10.0, factory=factory)
     conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute(f"PRAGMA cache_size = -{_CACHE_SIZE_KB}")
+    conn.execute(f"PRAGMA mmap_size = {_MMAP_SIZE}")
+    conn.execute("PRAGMA temp_store = MEMORY")
     conn.execute("PRAGMA foreign_keys = ON")
+    return conn
+
+
+def _acquire(shard: _Shard) -> sqlite3.Connection:
+    with shard.pool_lock:
+        if shard.pool:
+            return shard.pool.pop()
+    return _open_connection(shard.path)
+
+
+def _release(shard: _Shard, conn: sqlite3.Connection) -> None:
+    with shard.pool_lock:
+        # Connections opened before profiling was toggled are not reused.
+        if len(shard.pool) < _POOL_MAX_IDLE and isinstance(conn, _ProfiledConnection) == _profiling:
+            shard.pool.append(conn)
+            return
+    conn.close()
+
+
+def get_generation() -> int:
+    """A number that changes every time a write to the current database is committed."""
+    shard = _current_shard()
+    with shard.probe_lock:
+        if shard.probe is None:
+            shard.probe = sqlite3.connect(shard.path, check_same_thread=False)
+        return shard.probe.execute("PRAGMA data_version").fetchone()[0]
+
+
+def in_transaction() -> bool:
+    """True while this thread is inside a get_connection() block."""
+    return getattr(_local, "conn", None) is not None
+
+
+@contextlib.contextmanager
+def get_connection():
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        yield conn
+        return
+
+    shard = _current_shard()
+    conn = _acquire(shard)
+    _local.conn = conn
     try:
         yield conn
         conn.commit()
-    except Exception:
+    except BaseException:
         conn.rollback()
         raise
     finally:
-        conn.close()
+        _local.conn = None
+        _release(shard, conn)
+
+
+@contextlib.contextmanager
+def unit_of_work():
+    """Run several query functions as one transaction with a single commit.
+
+    Query functions called inside the block share its connection. The write
+    lock is taken up front so read-then-write sequences cannot interleave with
+    another writer. Nested units of work join the outermost one.
+    """
+    if getattr(_local, "conn", None) is not None:
+        yield _local.conn
+        return
+
+    with get_connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        yield conn
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import functools
+import threading
+from collections import OrderedDict
+
+from db.connection import current_db_path, get_generation, in_transaction
+
+# Process-wide LRU of query results, shared by every Streamlit session and
+# keyed by database file. Each entry remembers the database generation it was
+# read at and is treated as a miss once any write has been committed since.
+_MAX_ENTRIES = 512
+
+_entries: OrderedDict = OrderedDict()
+_lock = threading.Lock()
+
+
+def _freeze(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def cached(func):
+    """Cache a read-only query function's results until the next committed write.
+
+    Results are shared between callers and must not be mutated. Calls made
+    inside a transaction bypass the cache so they see their own writes.
+    """
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if in_transaction():
+            return func(*args, **kwargs)
+        key = (current_db_path(), name, _freeze(args), _freeze(tuple(sorted(kwargs.items()))))
+        generation = get_generation()
+        with _lock:
+            hit = _entries.get(key)
+            if hit is not None and hit[0] == generation:
+                _entries.move_to_end(key)
+                return hit[1]
+        result = func(*args, **kwargs)
+        with _lock:
+            _entries[key] = (generation, result)
+            _entries.move_to_end(key)
+            while len(_entries) > _MAX_ENTRIES:
+                _entries.popitem(last=False)
+        return result
+
+    wrapper.uncached = func
+    return wrapper
@@ -1,6 +1,8 @@
 from db.connection import get_connection
+from db.queries.cache import cached
 
 
+@cached
 def list_children() -> list:
     with get_connection() as conn:
         return conn.execute(
@@ -1,78 +1,179 @@
 from __future__ import annotations
 
+from datetime import date, timedelta
+
 from db.connection import get_connection
+from db.queries.cache import cached
 
 
-def upsert_instances(rows: list[dict]) -> None:
-    if not rows:
-        return
-    with get_connection() as conn:
-        conn.executemany(
-            "INSERT OR IGNORE INTO chore_instances (chore_id, scheduled_date) VALUES (:chore_id, :scheduled_date)",
-            rows,
-        )
+SWEEP_WATERMARK_KEY = "sweep_watermark"
 
 
-def get_instances_for_date(scheduled_date: str, child_id: int | None = None) -> list:
+def _sweep_watermark(conn) -> str:
+    row = conn.execute(
+        "SELECT value FROM settings WHERE key = ?", (SWEEP_WATERMARK_KEY,)
+    ).fetchone()
+    return row["value"] if row else ""
+
+
+# Occurrences from the sweep watermark onward are not stored. They are computed
+# from the chore templates at read time and merged with persisted rows. A row is
+# written only when an occurrence's status changes or the sweep marks it missed.
+# This predicate mirrors logic.recurrence.iter_chore_dates for chore `c` on `{day}`.
+_OCCURS_ON = """
+    {day} >= c.start_date
+    AND (c.end_date IS NULL OR {day} <= c.end_date)
+    AND (
+        (c.recurrence_type = 'once' AND {day} = c.start_date)
+        OR (c.recurrence_type IN ('daily', 'weekly') AND EXISTS (
+            SELECT 1 FROM json_each(c.recurrence_days)
+            WHERE value = (CAST(strftime('%w', {day}) AS INTEGER) + 6) % 7
+        ))
+    )
+"""
+
+_DAYS_CTE = """
+days(d) AS (
+    SELECT :first WHERE :first <= :last
+    UNION ALL
+    SELECT date(d, '+1 day') FROM days WHERE d < :last
+)
+"""
+
+# Persisted and archived rows in [:start, :end], plus virtual rows for
+# occurrences that have neither.
+_INSTANCES_CTE = f"""
+WITH RECURSIVE {_DAYS_CTE},
+instances AS (
+    SELECT id, chore_id, scheduled_date, status, completed_at, approved_at, created_at
+    FROM chore_instances
+    WHERE scheduled_date BETWEEN :start AND :end
+    UNION ALL
+    SELECT id, chore_id, scheduled_date, status, completed_at, approved_at, created_at
+    FROM chore_instances_archive
+    WHERE scheduled_date BETWEEN :start AND :end
+    UNION ALL
+    SELECT NULL, c.id, days.d,
+           CASE WHEN days.d < :today THEN 'missed' ELSE 'pending' END,
+           NULL, NULL, NULL
+    FROM chores c
+    JOIN days ON {_OCCURS_ON.format(day="days.d")}
+    WHERE c.is_active = 1
+      AND (:child_id IS NULL OR c.assigned_to = :child_id)
+      AND NOT EXISTS (
+          SELECT 1 FROM chore_instances p
+          WHERE p.chore_id = c.id AND p.scheduled_date = days.d
+      )
+)
+"""
+
+# Days swept for the first time are looked back over at most this far.
+_SWEEP_BACKFILL_DAYS = 14
+
+
+def _instance_params(conn, start: str, end: str, child_id: int | None) -> dict:
+    return {
+        "start": start,
+        "end": end,
+        "first": max(start, _sweep_watermark(conn)),
+        "last": end,
+        "today": date.today().isoformat(),
+        "child_id": child_id,
+    }
+
+
+def _select_instances(start: str, end: str, child_id: int | None) -> list:
+    child_filter = "AND c.assigned_to = :child_id" if child_id is not None else ""
     with get_connection() as conn:
-        if child_id is not None:
-            return conn.execute(
-                """
-                SELECT ci.*, c.title, c.description, c.allowance_type,
-                       c.fixed_amount, c.chore_weight, c.screen_time_hours,
-                       c.assigned_to, ch.name AS child_name
-                FROM chore_instances ci
-                JOIN chores c ON ci.chore_id = c.id
-                LEFT JOIN children ch ON c.assigned_to = ch.id
-                WHERE ci.scheduled_date = ? AND c.assigned_to = ? AND c.is_active = 1
-                ORDER BY c.title
-                """,
-                (scheduled_date, child_id),
-            ).fetchall()
         return conn.execute(
-            """
+            f"""
+            {_INSTANCES_CTE}
             SELECT ci.*, c.title, c.description, c.allowance_type,
                    c.fixed_amount, c.chore_weight, c.screen_time_hours,
                    c.assigned_to, ch.name AS child_name
-            FROM chore_instances ci
+            FROM instances ci
             JOIN chores c ON ci.chore_id = c.id
             LEFT JOIN children ch ON c.assigned_to = ch.id
-            WHERE ci.scheduled_date = ? AND c.is_active = 1
-            ORDER BY c.title
+            WHERE c.is_active = 1 {child_filter}
+            ORDER BY ci.scheduled_date, c.title
             """,
-            (scheduled_date,),
+            _instance_params(conn, start, end, child_id),
         ).fetchall()
 
 
-def get_instances_for_week(week_start: str, week_end: str, child_id: int | None = None) -> list:
+def materialize_instance(chore_id: int, scheduled_date: str) -> int | None:
+    """Persist an occurrence so its status can change; returns its instance id.
+
+    Returns None if the chore is inactive or does not occur on that date, and
+    for days the sweep has already settled: before the watermark nothing is
+    open any more, and an archived occurrence must not be recreated.
+    """
     with get_connection() as conn:
-        if child_id is not None:
-            return conn.execute(
-                """
-                SELECT ci.*, c.title, c.description, c.allowance_type,
-                       c.fixed_amount, c.chore_weight, c.screen_time_hours,
-                       c.assigned_to, ch.name AS child_name
+        conn.execute(
+            f"""
+            INSERT OR IGNORE INTO chore_instances (chore_id, scheduled_date)
+            SELECT c.id, :day FROM chores c
+            WHERE c.id = :chore_id AND c.is_active = 1
+              AND :day >= :watermark
+              AND {_OCCURS_ON.format(day=":day")}
+              AND NOT EXISTS (
+                  SELECT 1 FROM chore_instances_archive a
+                  WHERE a.chore_id = c.id AND a.scheduled_date = :day
+              )
+            """,
+            {"chore_id": chore_id, "day": scheduled_date, "watermark": _sweep_watermark(conn)},
+        )
+        row = conn.execute(
+            "SELECT id FROM chore_instances WHERE chore_id = ? AND scheduled_date = ?",
+            (chore_id, scheduled_date),
+        ).fetchone()
+        return row["id"] if row else None
+
+
+def prune_unscheduled_instances(chore_id: int, from_date: str) -> int:
+    """Delete a chore's pending instances on or after `from_date` that it no longer occurs on."""
+    with get_connection() as conn:
+        cur = conn.execute(
+            f"""
+            DELETE FROM chore_instances
+            WHERE id IN (
+                SELECT ci.id
                 FROM chore_instances ci
                 JOIN chores c ON ci.chore_id = c.id
-                LEFT JOIN children ch ON c.assigned_to = ch.id
-                WHERE ci.scheduled_date BETWEEN ? AND ?
-                  AND c.assigned_to = ? AND c.is_active = 1
-                ORDER BY ci.scheduled_date, c.title
-                """,
-                (week_start, week_end, child_id),
-            ).fetchall()
+                WHERE ci.chore_id = ? AND ci.scheduled_date >= ? AND ci.status = 'pending'
+                  AND NOT (c.is_active = 1 AND {_OCCURS_ON.format(day="ci.scheduled_date")})
+            )
+            """,
+            (chore_id, from_date),
+        )
+        return cur.rowcount
+
+
+def get_instances_for_date(scheduled_date: str, child_id: int | None = None) -> list:
+    return _select_instances(scheduled_date, scheduled_date, child_id)
+
+
+@cached
+def get_instances_for_week(week_start: str, week_end: str, child_id: int | None = None) -> list:
+    return _select_instances(week_start, week_end, child_id)
+
+
+@cached
+def get_status_counts_for_range(start: str, end: str, child_id: int | None = None) -> list:
+    """Instance counts per (scheduled_date, status), without loading instance rows."""
+    child_filter = "AND c.assigned_to = :child_id" if child_id is not None else ""
+    with get_connection() as conn:
         return conn.execute(
-            """
-            SELECT ci.*, c.title, c.description, c.allowance_type,
-                   c.fixed_amount, c.chore_weight, c.screen_time_hours,
-                   c.assigned_to, ch.name AS child_name
-            FROM chore_instances ci
+            f"""
+            {_INSTANCES_CTE}
+            SELECT ci.scheduled_date, ci.status, COUNT(*) AS total
+            FROM instances ci
             JOIN chores c ON ci.chore_id = c.id
-            LEFT JOIN children ch ON c.assigned_to = ch.id
-            WHERE ci.scheduled_date BETWEEN ? AND ? AND c.is_active = 1
-            ORDER BY ci.scheduled_date, c.title
+            WHERE c.is_active = 1 {child_filter}
+            GROUP BY ci.scheduled_date, ci.status
+            ORDER BY ci.scheduled_date
             """,
-            (week_start, week_end),
+            _instance_params(conn, start, end, child_id),
         ).fetchall()
 
 
@@ -87,6 +188,8 @@ def get_pending_approvals() -> list:
             JOIN chores c ON ci.chore_id = c.id
             LEFT JOIN children ch ON c.assigned_to = ch.id
             WHERE ci.status = 'completed_pending_approval' AND c.is_active = 1
+              -- repeats the partial index predicate so idx_chore_instances_open applies
+              AND ci.status IN ('pending', 'completed_pending_approval')
             ORDER BY ci.scheduled_date DESC, ch.name, c.title
             """
         ).fetchall()
@@ -118,6 +221,36 @@ def transition_to_approved(instance_id: int) -> bool:
         return cur.rowcount == 1
 
 
+def approve_instances(instance_ids: list[int]) -> list:
+    """Approve a batch of instances; returns the rows that actually transitioned."""
+    if not instance_ids:
+        return []
+    placeholders = ", ".join("?" for _ in instance_ids)
+    with get_connection() as conn:
+        rows = conn.execute(
+            f"""
+            SELECT ci.*, c.title, c.description, c.allowance_type,
+                   c.fixed_amount, c.chore_weight, c.screen_time_hours,
+                   c.assigned_to, ch.name AS child_name
+            FROM chore_instances ci
+            JOIN chores c ON ci.chore_id = c.id
+            LEFT JOIN children ch ON c.assigned_to = ch.id
+            WHERE ci.id IN ({placeholders})
+              AND ci.status IN ('pending', 'completed_pending_approval')
+            """,
+            list(instance_ids),
+        ).fetchall()
+        conn.executemany(
+            """
+            UPDATE chore_instances
+            SET status = 'approved', approved_at = datetime('now')
+            WHERE id = ? AND status IN ('pending', 'completed_pending_approval')
+            """,
+            [(row["id"],) for row in rows],
+        )
+        return rows
+
+
 def reset_to_pending(instance_id: int) -> bool:
     with get_connection() as conn:
         cur = conn.execute(
@@ -131,19 +264,143 @@ def reset_to_pending(instance_id: int) -> bool:
         return cur.rowcount == 1
 
 
-def sweep_missed_chores(before_date: str) -> int:
+def sweep_missed_chores(before_date: str) -> dict:
+    """Mark open instances dated before `before_date` as missed.
+
+    Only days between the previous sweep's watermark and `before_date` are
+    examined; occurrences there that were never persisted are written as
+    missed. Returns the number of instances marked missed per child id.
+    """
     with get_connection() as conn:
-        cur = conn.execute(
+        watermark = _sweep_watermark(conn)
+        if watermark >= before_date:
+            return {}
+        # Persist the occurrences that were only virtual, so they are swept too.
+        first = watermark or (
+            date.fromisoformat(before_date) - timedelta(days=_SWEEP_BACKFILL_DAYS)
+        ).isoformat()
+        conn.execute(
+            f"""
+            WITH RECURSIVE {_DAYS_CTE}
+            INSERT OR IGNORE INTO chore_instances (chore_id, scheduled_date)
+            SELECT c.id, days.d
+            FROM chores c
+            JOIN days ON {_OCCURS_ON.format(day="days.d")}
+            WHERE c.is_active = 1
+            """,
+            {
+                "first": first,
+                "last": (date.fromisoformat(before_date) - timedelta(days=1)).isoformat(),
+            },
+        )
+        counts = conn.execute(
+            """
+            SELECT c.assigned_to AS child_id, COUNT(*) AS missed
+            FROM chore_instances ci
+            JOIN chores c ON ci.chore_id = c.id
+            WHERE ci.scheduled_date >= ? AND ci.scheduled_date < ?
+              AND ci.status IN ('pending', 'completed_pending_approval')
+            GROUP BY c.assigned_to
+            """,
+            (watermark, before_date),
+        ).fetchall()
+        conn.execute(
             """
             UPDATE chore_instances
             SET status = 'missed'
-            WHERE scheduled_date < ? AND status IN ('pending', 'completed_pending_approval')
+            WHERE scheduled_date >= ? AND scheduled_date < ?
+              AND status IN ('pending', 'completed_pending_approval')
             """,
-            (before_date,),
+            (watermark, before_date),
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+            (SWEEP_WATERMARK_KEY, before_date),
+        )
+        return {row["child_id"]: row["missed"] for row in counts}
+
+
+# Monday of the week containing `{day}`, matching the app's week_start dates.
+_WEEK_START_OF = "date({day}, '-' || ((CAST(strftime('%w', {day}) AS INTEGER) + 6) % 7) || ' days')"
+
+# Settled instances that may leave the hot table. Approved weighted instances
+# of an assigned chore stay until their week has been finalized, since
+# finalization reads them; unassigned ones can never be finalized.
+_ARCHIVABLE = f"""
+    ci.scheduled_date < :before
+    AND ci.status IN ('approved', 'missed')
+    AND NOT (
+        ci.status = 'approved'
+        AND c.allowance_type IN ('weighted', 'both')
+        AND COALESCE(c.chore_weight, 0) > 0
+        AND c.assigned_to IS NOT NULL
+        AND NOT EXISTS (
+            SELECT 1 FROM weekly_allowance_snapshots s
+            WHERE s.child_id = c.assigned_to
+              AND s.week_start_date = {_WEEK_START_OF.format(day="ci.scheduled_date")}
+        )
+    )
+"""
+
+
+def archive_settled_instances(before_date: str) -> int:
+    """Move settled instances dated before `before_date` into the archive table.
+
+    Archived rows keep their ids and are still returned by the calendar and
+    weekly queries. Returns the number of instances archived.
+    """
+    with get_connection() as conn:
+        # Days from the sweep watermark on are shown from chore templates, so
+        # their rows must stay where the template merge can see them.
+        params = {"before": min(before_date, _sweep_watermark(conn))}
+        conn.execute(
+            f"""
+            INSERT OR IGNORE INTO chore_instances_archive (
+                id, chore_id, child_id, week_start_date, scheduled_date,
+                status, completed_at, approved_at, created_at
+            )
+            SELECT ci.id, ci.chore_id, c.assigned_to,
+                   {_WEEK_START_OF.format(day="ci.scheduled_date")},
+                   ci.scheduled_date, ci.status, ci.completed_at, ci.approved_at,
+                   ci.created_at
+            FROM chore_instances ci
+            JOIN chores c ON ci.chore_id = c.id
+            WHERE {_ARCHIVABLE}
+            """,
+            params,
+        )
+        cur = conn.execute(
+            f"""
+            DELETE FROM chore_instances
+            WHERE id IN (
+                SELECT ci.id FROM chore_instances ci
+                JOIN chores c ON ci.chore_id = c.id
+                WHERE {_ARCHIVABLE}
+            )
+            """,
+            params,
         )
         return cur.rowcount
 
 
+def get_archived_week_rollups(child_id: int, limit: int = 52) -> list:
+    """Approved and missed counts per archived week for a child, newest first."""
+    with get_connection() as conn:
+        return conn.execute(
+            """
+            SELECT week_start_date,
+                   SUM(status = 'approved') AS approved,
+                   SUM(status = 'missed')   AS missed
+            FROM chore_instances_archive
+            WHERE child_id = ?
+            GROUP BY week_start_date
+            ORDER BY week_start_date DESC
+            LIMIT ?
+            """,
+            (child_id, limit),
+        ).fetchall()
+
+
 def get_instance(instance_id: int):
     with get_connection() as conn:
         return conn.execute(
@@ -165,13 +422,87 @@ def get_approved_weighted_instances_for_week(child_id: int, week_start: str, wee
     with get_connection() as conn:
         return conn.execute(
             """
-            SELECT ci.*, c.chore_weight, c.title
-            FROM chore_instances ci
+            SELECT ci.id, ci.chore_id, ci.scheduled_date, ci.status,
+                   ci.completed_at, ci.approved_at, ci.created_at,
+                   c.chore_weight, c.title
+            FROM (
+                SELECT id, chore_id, scheduled_date, status, completed_at, approved_at, created_at
+                FROM chore_instances
+                WHERE scheduled_date BETWEEN :week_start AND :week_end
+                UNION ALL
+                SELECT id, chore_id, scheduled_date, status, completed_at, approved_at, created_at
+                FROM chore_instances_archive
+                WHERE child_id = :child_id AND week_start_date = :week_start
+            ) ci
             JOIN chores c ON ci.chore_id = c.id
             WHERE ci.status = 'approved'
-              AND c.assigned_to = ?
+              AND c.assigned_to = :child_id
+              AND c.allowance_type IN ('weighted', 'both')
+              AND ci.scheduled_date BETWEEN :week_start AND :week_end
+            """,
+            {"child_id": child_id, "week_start": week_start, "week_end": week_end},
+        ).fetchall()
+
+
+def get_approved_weighted_instances_for_week_all(week_start: str, week_end: str) -> list:
+    """Approved weighted instances for every child whose week is not yet
+    finalized, ordered by child; each row carries its `assigned_to`."""
+    with get_connection() as conn:
+        return conn.execute(
+            """
+            SELECT ci.id, ci.chore_id, ci.scheduled_date, ci.status,
+                   ci.completed_at, ci.approved_at, ci.created_at,
+                   c.chore_weight, c.title, c.assigned_to
+            FROM (
+                SELECT id, chore_id, scheduled_date, status, completed_at, approved_at, created_at
+                FROM chore_instances
+                WHERE scheduled_date BETWEEN :week_start AND :week_end
+                UNION ALL
+                SELECT id, chore_id, scheduled_date, status, completed_at, approved_at, created_at
+                FROM chore_instances_archive
+                WHERE week_start_date = :week_start
+            ) ci
+            JOIN chores c ON ci.chore_id = c.id
+            WHERE ci.status = 'approved'
+              AND c.allowance_type IN ('weighted', 'both')
+              AND ci.scheduled_date BETWEEN :week_start AND :week_end
+              AND NOT EXISTS (
+                  SELECT 1 FROM weekly_allowance_snapshots s
+                  WHERE s.child_id = c.assigned_to AND s.week_start_date = :week_start
+              )
+            ORDER BY c.assigned_to, ci.scheduled_date, ci.id
+            """,
+            {"week_start": week_start, "week_end": week_end},
+        ).fetchall()
+
+
+def get_unfinalized_week_starts(before_week_start: str) -> list[str]:
+    """Week starts before `before_week_start` that have approved weighted
+    instances for a child whose week has no allowance snapshot, oldest first.
+
+    Such instances are never archived (see _ARCHIVABLE), so only the hot
+    table needs to be searched. Chores without a positive weight or without a
+    child are ignored, as finalizing them records nothing.
+    """
+    week_start = _WEEK_START_OF.format(day="ci.scheduled_date")
+    with get_connection() as conn:
+        rows = conn.execute(
+            f"""
+            SELECT DISTINCT {week_start} AS week_start
+            FROM chore_instances ci
+            JOIN chores c ON ci.chore_id = c.id
+            WHERE ci.scheduled_date < :before
+              AND ci.status = 'approved'
               AND c.allowance_type IN ('weighted', 'both')
-              AND ci.scheduled_date BETWEEN ? AND ?
+              AND c.chore_weight > 0
+              AND c.assigned_to IS NOT NULL
+              AND NOT EXISTS (
+                  SELECT 1 FROM weekly_allowance_snapshots s
+                  WHERE s.child_id = c.assigned_to
+                    AND s.week_start_date = {week_start}
+              )
+            ORDER BY week_start
             """,
-            (child_id, week_start, week_end),
+            {"before": before_week_start},
         ).fetchall()
+        return [row["week_start"] for row in rows]
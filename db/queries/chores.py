@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 from db.connection import get_connection
+from db.queries.cache import cached
 
 
+@cached
 def list_chores(child_id: int | None = None, active_only: bool = True) -> list:
     with get_connection() as conn:
         conditions = []
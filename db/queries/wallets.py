@@ -1,19 +1,123 @@
 from __future__ import annotations
 
 from db.connection import get_connection
+from db.queries.cache import cached
+from db.schema import REBUILD_CHECKPOINTS_SQL
 
 
+@cached
 def get_balance(child_id: int, transaction_type: str) -> float:
     with get_connection() as conn:
         row = conn.execute(
             """
-            SELECT COALESCE(SUM(amount), 0.0) AS total
-            FROM wallet_transactions
+            SELECT balance
+            FROM wallet_balances
             WHERE child_id = ? AND transaction_type = ?
             """,
             (child_id, transaction_type),
         ).fetchone()
-        return row["total"] if row else 0.0
+        return row["balance"] if row else 0.0
+
+
+@cached
+def get_wallet_summaries(child_ids: list[int], week_start: str) -> dict[int, dict]:
+    """Money, screen time and week-finalized flag for each child, in one query."""
+    if not child_ids:
+        return {}
+    placeholders = ", ".join("?" for _ in child_ids)
+    with get_connection() as conn:
+        rows = conn.execute(
+            f"""
+            SELECT ch.id AS child_id,
+                   COALESCE(SUM(CASE WHEN wb.transaction_type = 'monetary'
+                                     THEN wb.balance END), 0.0) AS monetary,
+                   COALESCE(SUM(CASE WHEN wb.transaction_type = 'screen_time'
+                                     THEN wb.balance END), 0.0) AS screen_time,
+                   EXISTS (
+                       SELECT 1 FROM weekly_allowance_snapshots s
+                       WHERE s.child_id = ch.id AND s.week_start_date = ?
+                   ) AS week_finalized
+            FROM children ch
+            LEFT JOIN wallet_balances wb ON wb.child_id = ch.id
+            WHERE ch.id IN ({placeholders})
+            GROUP BY ch.id
+            """,
+            (week_start, *child_ids),
+        ).fetchall()
+    summaries = {
+        child_id: {"monetary": 0.0, "screen_time": 0.0, "week_finalized": False}
+        for child_id in child_ids
+    }
+    for row in rows:
+        summaries[row["child_id"]] = {
+            "monetary": row["monetary"],
+            "screen_time": row["screen_time"],
+            "week_finalized": bool(row["week_finalized"]),
+        }
+    return summaries
+
+
+def get_balance_through(child_id: int, transaction_type: str, through_tx_id: int) -> float:
+    """Balance including every ledger row up to and including `through_tx_id`.
+
+    Starts from the nearest checkpoint at or before that row and sums only the
+    rows after it.
+    """
+    with get_connection() as conn:
+        row = conn.execute(
+            """
+            WITH cp AS (
+                SELECT through_tx_id, balance
+                FROM wallet_checkpoints
+                WHERE child_id = :child_id AND transaction_type = :type
+                  AND through_tx_id <= :through
+                ORDER BY through_tx_id DESC
+                LIMIT 1
+            )
+            SELECT COALESCE((SELECT balance FROM cp), 0.0) + COALESCE((
+                SELECT SUM(amount) FROM wallet_transactions
+                WHERE child_id = :child_id AND transaction_type = :type
+                  AND id > COALESCE((SELECT through_tx_id FROM cp), 0)
+                  AND id <= :through
+            ), 0.0) AS balance
+            """,
+            {"child_id": child_id, "type": transaction_type, "through": through_tx_id},
+        ).fetchone()
+        return row["balance"]
+
+
+def get_balance_as_of(child_id: int, transaction_type: str, as_of: str) -> float:
+    """Balance from ledger rows created at or before `as_of` (a 'YYYY-MM-DD HH:MM:SS' UTC string)."""
+    with get_connection() as conn:
+        row = conn.execute(
+            """
+            SELECT id FROM wallet_transactions
+            WHERE child_id = ? AND transaction_type = ? AND created_at <= ?
+            ORDER BY created_at DESC, id DESC
+            LIMIT 1
+            """,
+            (child_id, transaction_type, as_of),
+        ).fetchone()
+        if row is None:
+            return 0.0
+        return get_balance_through(child_id, transaction_type, row["id"])
+
+
+def rebuild_wallet_balances() -> int:
+    """Recompute wallet_balances and checkpoints from the ledger; returns the number of balance rows."""
+    with get_connection() as conn:
+        conn.execute("DELETE FROM wallet_balances")
+        cur = conn.execute(
+            """
+            INSERT INTO wallet_balances (child_id, transaction_type, balance, tx_count)
+            SELECT child_id, transaction_type, SUM(amount), COUNT(*)
+            FROM wallet_transactions
+            GROUP BY child_id, transaction_type
+            """
+        )
+        conn.execute("DELETE FROM wallet_checkpoints")
+        conn.execute(REBUILD_CHECKPOINTS_SQL)
+        return cur.rowcount
 
 
 def credit_wallet(
@@ -38,19 +142,45 @@ def credit_wallet(
             return False
 
 
-def get_transactions(child_id: int, limit: int = 50) -> list:
+def credit_wallet_many(credits: list[dict]) -> None:
+    """Insert many ledger rows at once; keys match credit_wallet's parameters."""
+    if not credits:
+        return
     with get_connection() as conn:
-        return conn.execute(
+        conn.executemany(
             """
-            SELECT wt.*, ci.scheduled_date, c.title AS chore_title
+            INSERT OR IGNORE INTO wallet_transactions
+                (child_id, chore_instance_id, transaction_type, amount, note)
+            VALUES (:child_id, :chore_instance_id, :transaction_type, :amount, :note)
+            """,
+            credits,
+        )
+
+
+def get_transactions_page(
+    child_id: int, before: tuple[str, int] | None = None, limit: int = 20
+) -> list:
+    """Newest-first page of a child's ledger, strictly older than the `before` cursor.
+
+    The cursor is the (created_at, id) of the last row of the previous page, so
+    each page is a single index range scan however deep into history it is.
+    """
+    cursor_filter = "AND (wt.created_at, wt.id) < (:created_at, :id)" if before else ""
+    created_at, tx_id = before if before else (None, None)
+    with get_connection() as conn:
+        return conn.execute(
+            f"""
+            SELECT wt.*, COALESCE(ci.scheduled_date, ca.scheduled_date) AS scheduled_date,
+                   c.title AS chore_title
             FROM wallet_transactions wt
             LEFT JOIN chore_instances ci ON wt.chore_instance_id = ci.id
-            LEFT JOIN chores c ON ci.chore_id = c.id
-            WHERE wt.child_id = ?
-            ORDER BY wt.created_at DESC
-            LIMIT ?
+            LEFT JOIN chore_instances_archive ca ON wt.chore_instance_id = ca.id
+            LEFT JOIN chores c ON c.id = COALESCE(ci.chore_id, ca.chore_id)
+            WHERE wt.child_id = :child_id {cursor_filter}
+            ORDER BY wt.created_at DESC, wt.id DESC
+            LIMIT :limit
             """,
-            (child_id, limit),
+            {"child_id": child_id, "created_at": created_at, "id": tx_id, "limit": limit},
         ).fetchall()
 
 
@@ -63,6 +193,15 @@ def is_week_finalized(child_id: int, week_start: str) -> bool:
         return row is not None
 
 
+def get_finalized_child_ids(week_start: str) -> set[int]:
+    with get_connection() as conn:
+        rows = conn.execute(
+            "SELECT child_id FROM weekly_allowance_snapshots WHERE week_start_date = ?",
+            (week_start,),
+        ).fetchall()
+        return {row["child_id"] for row in rows}
+
+
 def save_week_snapshot(
     child_id: int, week_start: str, total_payout: float, calculation_json: str
 ) -> None:
@@ -75,3 +214,18 @@ def save_week_snapshot(
             """,
             (child_id, week_start, total_payout, calculation_json),
         )
+
+
+def save_week_snapshots(snapshots: list[dict]) -> None:
+    """Insert many snapshots at once; keys match save_week_snapshot's parameters."""
+    if not snapshots:
+        return
+    with get_connection() as conn:
+        conn.executemany(
+            """
+            INSERT OR IGNORE INTO weekly_allowance_snapshots
+                (child_id, week_start_date, total_payout, calculation_json)
+            VALUES (:child_id, :week_start, :total_payout, :calculation_json)
+            """,
+            snapshots,
+        )
@@ -1,7 +1,14 @@
+from __future__ import annotations
+
 import hashlib
 from db.connection import get_connection
 
 _DDL = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    version    INTEGER PRIMARY KEY,
+    applied_at TEXT NOT NULL DEFAULT (datetime('now'))
+);
+
 CREATE TABLE IF NOT EXISTS settings (
     key   TEXT PRIMARY KEY,
     value TEXT NOT NULL
@@ -67,9 +74,262 @@ CREATE TABLE IF NOT EXISTS weekly_allowance_snapshots (
 """
 
 
+# Keep wallet_balances in step with the ledger, inside the writing transaction.
+_WALLET_BALANCE_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_wallet_tx_insert
+    AFTER INSERT ON wallet_transactions
+    BEGIN
+        INSERT INTO wallet_balances (child_id, transaction_type, balance, tx_count)
+        VALUES (NEW.child_id, NEW.transaction_type, NEW.amount, 1)
+        ON CONFLICT (child_id, transaction_type) DO UPDATE SET
+            balance  = balance + excluded.balance,
+            tx_count = tx_count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_wallet_tx_delete
+    AFTER DELETE ON wallet_transactions
+    BEGIN
+        UPDATE wallet_balances
+        SET balance = balance - OLD.amount, tx_count = tx_count - 1
+        WHERE child_id = OLD.child_id AND transaction_type = OLD.transaction_type;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_wallet_tx_update
+    AFTER UPDATE OF child_id, transaction_type, amount ON wallet_transactions
+    BEGIN
+        UPDATE wallet_balances
+        SET balance = balance - OLD.amount, tx_count = tx_count - 1
+        WHERE child_id = OLD.child_id AND transaction_type = OLD.transaction_type;
+        INSERT INTO wallet_balances (child_id, transaction_type, balance, tx_count)
+        VALUES (NEW.child_id, NEW.transaction_type, NEW.amount, 1)
+        ON CONFLICT (child_id, transaction_type) DO UPDATE SET
+            balance  = balance + excluded.balance,
+            tx_count = tx_count + 1;
+    END
+    """,
+]
+
+# Every this many ledger rows per child and type, the running balance is
+# checkpointed so historical balances need only sum the rows after it.
+CHECKPOINT_EVERY = 500
+
+# Replace the balance triggers with versions that also write checkpoints, and
+# discard checkpoints that a changed or deleted ledger row makes stale.
+_WALLET_CHECKPOINT_TRIGGERS = [
+    "DROP TRIGGER IF EXISTS trg_wallet_tx_insert",
+    "DROP TRIGGER IF EXISTS trg_wallet_tx_delete",
+    "DROP TRIGGER IF EXISTS trg_wallet_tx_update",
+    f"""
+    CREATE TRIGGER trg_wallet_tx_insert
+    AFTER INSERT ON wallet_transactions
+    BEGIN
+        INSERT INTO wallet_balances (child_id, transaction_type, balance, tx_count)
+        VALUES (NEW.child_id, NEW.transaction_type, NEW.amount, 1)
+        ON CONFLICT (child_id, transaction_type) DO UPDATE SET
+            balance  = balance + excluded.balance,
+            tx_count = tx_count + 1;
+        INSERT INTO wallet_checkpoints
+            (child_id, transaction_type, through_tx_id, through_created_at, balance, tx_count)
+        SELECT child_id, transaction_type, NEW.id, NEW.created_at, balance, tx_count
+        FROM wallet_balances
+        WHERE child_id = NEW.child_id AND transaction_type = NEW.transaction_type
+          AND tx_count % {CHECKPOINT_EVERY} = 0;
+    END
+    """,
+    """
+    CREATE TRIGGER trg_wallet_tx_delete
+    AFTER DELETE ON wallet_transactions
+    BEGIN
+        UPDATE wallet_balances
+        SET balance = balance - OLD.amount, tx_count = tx_count - 1
+        WHERE child_id = OLD.child_id AND transaction_type = OLD.transaction_type;
+        DELETE FROM wallet_checkpoints
+        WHERE child_id = OLD.child_id AND transaction_type = OLD.transaction_type
+          AND through_tx_id >= OLD.id;
+    END
+    """,
+    """
+    CREATE TRIGGER trg_wallet_tx_update
+    AFTER UPDATE OF child_id, transaction_type, amount ON wallet_transactions
+    BEGIN
+        UPDATE wallet_balances
+        SET balance = balance - OLD.amount, tx_count = tx_count - 1
+        WHERE child_id = OLD.child_id AND transaction_type = OLD.transaction_type;
+        INSERT INTO wallet_balances (child_id, transaction_type, balance, tx_count)
+        VALUES (NEW.child_id, NEW.transaction_type, NEW.amount, 1)
+        ON CONFLICT (child_id, transaction_type) DO UPDATE SET
+            balance  = balance + excluded.balance,
+            tx_count = tx_count + 1;
+        DELETE FROM wallet_checkpoints
+        WHERE ((child_id = OLD.child_id AND transaction_type = OLD.transaction_type)
+               OR (child_id = NEW.child_id AND transaction_type = NEW.transaction_type))
+          AND through_tx_id >= OLD.id;
+    END
+    """,
+]
+
+# Checkpoints at every CHECKPOINT_EVERY-th ledger row, computed from scratch.
+REBUILD_CHECKPOINTS_SQL = f"""
+INSERT INTO wallet_checkpoints
+    (child_id, transaction_type, through_tx_id, through_created_at, balance, tx_count)
+SELECT child_id, transaction_type, id, created_at, running_balance, row_number
+FROM (
+    SELECT child_id, transaction_type, id, created_at,
+           SUM(amount) OVER w   AS running_balance,
+           ROW_NUMBER() OVER w  AS row_number
+    FROM wallet_transactions
+    WINDOW w AS (PARTITION BY child_id, transaction_type ORDER BY id)
+)
+WHERE row_number % {CHECKPOINT_EVERY} = 0
+"""
+
+# Ordered schema changes applied on top of _DDL. Entry N (1-based) upgrades a
+# database from version N-1 to N; append new migrations, never edit old ones.
+_MIGRATIONS: list[list[str]] = [
+    # 1: secondary indexes for calendar, approval, sweep and balance queries
+    [
+        "CREATE INDEX IF NOT EXISTS idx_chore_instances_date_status "
+        "ON chore_instances (scheduled_date, status)",
+        "CREATE INDEX IF NOT EXISTS idx_chore_instances_status_date "
+        "ON chore_instances (status, scheduled_date)",
+        "CREATE INDEX IF NOT EXISTS idx_chores_assigned_active "
+        "ON chores (assigned_to, is_active)",
+        "CREATE INDEX IF NOT EXISTS idx_wallet_tx_child_type "
+        "ON wallet_transactions (child_id, transaction_type)",
+    ],
+    # 2: running wallet balances maintained by triggers on the ledger
+    [
+        """
+        CREATE TABLE IF NOT EXISTS wallet_balances (
+            child_id         INTEGER NOT NULL REFERENCES children(id) ON DELETE CASCADE,
+            transaction_type TEXT    NOT NULL,
+            balance          REAL    NOT NULL DEFAULT 0.0,
+            tx_count         INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (child_id, transaction_type)
+        ) WITHOUT ROWID
+        """,
+        *_WALLET_BALANCE_TRIGGERS,
+        "DELETE FROM wallet_balances",
+        """
+        INSERT INTO wallet_balances (child_id, transaction_type, balance, tx_count)
+        SELECT child_id, transaction_type, SUM(amount), COUNT(*)
+        FROM wallet_transactions
+        GROUP BY child_id, transaction_type
+        """,
+    ],
+    # 3: per-chore high-water mark for recurrence expansion
+    [
+        "ALTER TABLE chores ADD COLUMN expanded_through TEXT",
+    ],
+    # 4: partial index over open instances only, replacing the full status
+    # index; serves the missed-chore sweep and the approval queue
+    [
+        "DROP INDEX IF EXISTS idx_chore_instances_status_date",
+        "CREATE INDEX IF NOT EXISTS idx_chore_instances_open "
+        "ON chore_instances (status, scheduled_date) "
+        "WHERE status IN ('pending', 'completed_pending_approval')",
+    ],
+    # 5: upcoming occurrences are computed at read time; drop pre-expanded
+    # rows that were never touched
+    [
+        "DELETE FROM chore_instances "
+        "WHERE status = 'pending' AND completed_at IS NULL "
+        "AND scheduled_date >= date('now', 'localtime')",
+    ],
+    # 6: archive for settled instances. The ledger is rebuilt without its
+    # foreign key to chore_instances so archived rows can leave the hot table.
+    [
+        """
+        CREATE TABLE wallet_transactions_new (
+            id                INTEGER PRIMARY KEY AUTOINCREMENT,
+            child_id          INTEGER NOT NULL REFERENCES children(id) ON DELETE CASCADE,
+            chore_instance_id INTEGER,
+            transaction_type  TEXT NOT NULL CHECK(transaction_type IN ('monetary','screen_time')),
+            amount            REAL NOT NULL,
+            note              TEXT,
+            created_at        TEXT NOT NULL DEFAULT (datetime('now')),
+            UNIQUE(chore_instance_id, transaction_type)
+        )
+        """,
+        "INSERT INTO wallet_transactions_new SELECT * FROM wallet_transactions",
+        "DROP TABLE wallet_transactions",
+        "ALTER TABLE wallet_transactions_new RENAME TO wallet_transactions",
+        "CREATE INDEX IF NOT EXISTS idx_wallet_tx_child_type "
+        "ON wallet_transactions (child_id, transaction_type)",
+        *_WALLET_BALANCE_TRIGGERS,
+        """
+        CREATE TABLE IF NOT EXISTS chore_instances_archive (
+            id              INTEGER PRIMARY KEY,
+            chore_id        INTEGER NOT NULL,
+            child_id        INTEGER REFERENCES children(id) ON DELETE CASCADE,
+            week_start_date TEXT    NOT NULL,
+            scheduled_date  TEXT    NOT NULL,
+            status          TEXT    NOT NULL,
+            completed_at    TEXT,
+            approved_at     TEXT,
+            created_at      TEXT,
+            archived_at     TEXT    NOT NULL DEFAULT (datetime('now'))
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_archive_date "
+        "ON chore_instances_archive (scheduled_date)",
+        "CREATE INDEX IF NOT EXISTS idx_archive_child_week "
+        "ON chore_instances_archive (child_id, week_start_date)",
+    ],
+    # 7: periodic ledger checkpoints for historical balance reads
+    [
+        """
+        CREATE TABLE IF NOT EXISTS wallet_checkpoints (
+            child_id           INTEGER NOT NULL REFERENCES children(id) ON DELETE CASCADE,
+            transaction_type   TEXT    NOT NULL,
+            through_tx_id      INTEGER NOT NULL,
+            through_created_at TEXT    NOT NULL,
+            balance            REAL    NOT NULL,
+            tx_count           INTEGER NOT NULL,
+            PRIMARY KEY (child_id, transaction_type, through_tx_id)
+        ) WITHOUT ROWID
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_wallet_tx_child_type_created "
+        "ON wallet_transactions (child_id, transaction_type, created_at)",
+        *_WALLET_CHECKPOINT_TRIGGERS,
+        REBUILD_CHECKPOINTS_SQL,
+    ],
+    # 8: keyset pagination of a child's transaction history
+    [
+        "CREATE INDEX IF NOT EXISTS idx_wallet_tx_child_created_id "
+        "ON wallet_transactions (child_id, created_at, id)",
+    ],
+]
+
+SCHEMA_VERSION = len(_MIGRATIONS)
+
+
+def _current_version(conn) -> int:
+    row = conn.execute("SELECT MAX(version) AS v FROM schema_version").fetchone()
+    return row["v"] or 0
+
+
+def _run_migrations(conn) -> None:
+    if _current_version(conn) >= SCHEMA_VERSION:
+        return
+    conn.execute("BEGIN IMMEDIATE")
+    # Re-read under the write lock in case another process migrated first.
+    version = _current_version(conn)
+    for number, statements in enumerate(_MIGRATIONS[version:], start=version + 1):
+        for statement in statements:
+            conn.execute(statement)
+        conn.execute("INSERT INTO schema_version (version) VALUES (?)", (number,))
+    conn.commit()
+    conn.execute("PRAGMA optimize")
+
+
 def initialize_db():
     with get_connection() as conn:
         conn.executescript(_DDL)
+        _run_migrations(conn)
 
 
 def seed_defaults():
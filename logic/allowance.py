@@ -1,34 +1,62 @@
-from db.queries.chore_instances import get_approved_weighted_instances_for_week
-from db.queries.wallets import credit_wallet, is_week_finalized, save_week_snapshot
-from db.queries.children import get_child
+from __future__ import annotations
+
+from datetime import date, timedelta
+from itertools import groupby
+
+from db.connection import unit_of_work
+from db.queries.chore_instances import (
+    get_approved_weighted_instances_for_week,
+    get_approved_weighted_instances_for_week_all,
+    get_unfinalized_week_starts,
+)
+from db.queries.wallets import (
+    credit_wallet_many,
+    get_finalized_child_ids,
+    is_week_finalized,
+    save_week_snapshot,
+    save_week_snapshots,
+)
+from db.queries.children import get_child, list_children
 import json
 
 
-def credit_fixed_and_screen_time(instance) -> None:
+def fixed_and_screen_time_credits(instance) -> list[dict]:
     child_id = instance["assigned_to"]
     instance_id = instance["id"]
     allowance_type = instance["allowance_type"]
+    credits = []
 
     if allowance_type in ("fixed", "both") and instance["fixed_amount"]:
-        credit_wallet(
-            child_id=child_id,
-            chore_instance_id=instance_id,
-            transaction_type="monetary",
-            amount=instance["fixed_amount"],
-            note=f"Fixed allowance for: {instance['title']}",
-        )
+        credits.append({
+            "child_id": child_id,
+            "chore_instance_id": instance_id,
+            "transaction_type": "monetary",
+            "amount": instance["fixed_amount"],
+            "note": f"Fixed allowance for: {instance['title']}",
+        })
 
     if instance["screen_time_hours"] and instance["screen_time_hours"] > 0:
-        credit_wallet(
-            child_id=child_id,
-            chore_instance_id=instance_id,
-            transaction_type="screen_time",
-            amount=instance["screen_time_hours"],
-            note=f"Screen time for: {instance['title']}",
-        )
+        credits.append({
+            "child_id": child_id,
+            "chore_instance_id": instance_id,
+            "transaction_type": "screen_time",
+            "amount": instance["screen_time_hours"],
+            "note": f"Screen time for: {instance['title']}",
+        })
+
+    return credits
+
+
+def credit_fixed_and_screen_time(instance) -> None:
+    credit_wallet_many(fixed_and_screen_time_credits(instance))
 
 
 def finalize_week(child_id: int, week_start: str, week_end: str) -> dict:
+    with unit_of_work():
+        return _finalize_week(child_id, week_start, week_end)
+
+
+def _finalize_week(child_id: int, week_start: str, week_end: str) -> dict:
     if is_week_finalized(child_id, week_start):
         return {"status": "already_finalized"}
 
@@ -42,12 +70,29 @@ def finalize_week(child_id: int, week_start: str, week_end: str) -> dict:
     if not instances:
         return {"status": "no_weighted_chores"}
 
+    result, credits = _weighted_payouts(child_id, budget, instances)
+    if result["status"] != "finalized":
+        return result
+
+    credit_wallet_many(credits)
+    save_week_snapshot(
+        child_id=child_id,
+        week_start=week_start,
+        total_payout=result["total_payout"],
+        calculation_json=json.dumps(result["details"]),
+    )
+    return result
+
+
+def _weighted_payouts(child_id: int, budget: float, instances) -> tuple[dict, list[dict]]:
+    """Split `budget` across instances by weight; returns (result, credits)."""
     total_weight = sum(i["chore_weight"] for i in instances if i["chore_weight"])
     if total_weight == 0:
-        return {"status": "zero_weight"}
+        return {"status": "zero_weight"}, []
 
     total_payout = 0.0
     calculation = []
+    credits = []
     for inst in instances:
         weight = inst["chore_weight"] or 0
         payout = (weight / total_weight) * budget
@@ -58,22 +103,78 @@ def finalize_week(child_id: int, week_start: str, week_end: str) -> dict:
             "weight": weight,
             "payout": round(payout, 2),
         })
-        credit_wallet(
-            child_id=child_id,
-            chore_instance_id=inst["id"],
-            transaction_type="monetary",
-            amount=round(payout, 2),
-            note=f"Weighted allowance for: {inst['title']}",
-        )
+        credits.append({
+            "child_id": child_id,
+            "chore_instance_id": inst["id"],
+            "transaction_type": "monetary",
+            "amount": round(payout, 2),
+            "note": f"Weighted allowance for: {inst['title']}",
+        })
 
-    save_week_snapshot(
-        child_id=child_id,
-        week_start=week_start,
-        total_payout=round(total_payout, 2),
-        calculation_json=json.dumps(calculation),
-    )
     return {
         "status": "finalized",
         "total_payout": round(total_payout, 2),
         "details": calculation,
+    }, credits
+
+
+def finalize_week_all(week_start: str) -> dict[int, dict]:
+    """Finalize the week for every child in one transaction.
+
+    Returns each child's result keyed by child id, with the same statuses as
+    finalize_week().
+    """
+    week_end = (date.fromisoformat(week_start) + timedelta(days=6)).isoformat()
+    with unit_of_work():
+        children = list_children()
+        finalized = get_finalized_child_ids(week_start)
+        by_child = {
+            child_id: list(rows)
+            for child_id, rows in groupby(
+                get_approved_weighted_instances_for_week_all(week_start, week_end),
+                key=lambda row: row["assigned_to"],
+            )
+        }
+
+        results = {}
+        credits = []
+        snapshots = []
+        for child in children:
+            child_id = child["id"]
+            if child_id in finalized:
+                results[child_id] = {"status": "already_finalized"}
+                continue
+            instances = by_child.get(child_id)
+            if not instances:
+                results[child_id] = {"status": "no_weighted_chores"}
+                continue
+            result, child_credits = _weighted_payouts(
+                child_id, child["weekly_allowance_budget"], instances
+            )
+            results[child_id] = result
+            if result["status"] == "finalized":
+                credits.extend(child_credits)
+                snapshots.append({
+                    "child_id": child_id,
+                    "week_start": week_start,
+                    "total_payout": result["total_payout"],
+                    "calculation_json": json.dumps(result["details"]),
+                })
+
+        credit_wallet_many(credits)
+        save_week_snapshots(snapshots)
+        return results
+
+
+def finalize_completed_weeks(today: date) -> dict[str, dict[int, dict]]:
+    """Finalize every week that ended before `today` and still has unpaid
+    weighted chores, oldest first; returns finalize_week_all() results by week.
+
+    Each week is its own transaction, so a long backlog does not hold the
+    write lock throughout, and a week already finalized by hand is skipped.
+    """
+    current_week_start = (today - timedelta(days=today.weekday())).isoformat()
+    return {
+        week_start: finalize_week_all(week_start)
+        for week_start in get_unfinalized_week_starts(current_week_start)
     }
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+from db.connection import each_household
+from db.queries.chore_instances import archive_settled_instances, sweep_missed_chores
+from db.queries.settings import get_setting
+from logic.allowance import finalize_completed_weeks
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_AFTER_DAYS_KEY = "archive_after_days"
+DEFAULT_ARCHIVE_AFTER_DAYS = 180
+
+_thread: threading.Thread | None = None
+_start_lock = threading.Lock()
+
+
+def archive_after_days() -> int:
+    value = get_setting(ARCHIVE_AFTER_DAYS_KEY)
+    return int(value) if value else DEFAULT_ARCHIVE_AFTER_DAYS
+
+
+def run_maintenance(today: date | None = None) -> None:
+    """Sweep past-due chores to missed, pay out weighted allowances for weeks
+    that have ended, then archive old settled history."""
+    today = today or date.today()
+    missed = sweep_missed_chores(today.isoformat())
+    if missed:
+        logger.info("Marked chores missed per child: %s", missed)
+    for week_start, results in finalize_completed_weeks(today).items():
+        paid = {
+            child_id: r["total_payout"]
+            for child_id, r in results.items()
+            if r["status"] == "finalized"
+        }
+        logger.info("Finalized week of %s, payouts per child: %s", week_start, paid)
+    archived = archive_settled_instances(
+        (today - timedelta(days=archive_after_days())).isoformat()
+    )
+    if archived:
+        logger.info("Archived %d settled chore instances", archived)
+
+
+def _seconds_until_next_run(now: datetime) -> float:
+    # A few seconds past local midnight, so date.today() has rolled over.
+    next_run = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+    return (next_run - now).total_seconds() + 5
+
+
+def run_maintenance_all(today: date | None = None) -> None:
+    """run_maintenance() on every household's database, one at a time."""
+    for household in each_household():
+        try:
+            run_maintenance(today)
+        except Exception:
+            logger.exception("Scheduled maintenance failed for household %s", household)
+
+
+def _maintenance_loop() -> None:
+    while True:
+        # Keep the thread alive if listing households fails, so the next
+        # scheduled run still happens.
+        try:
+            run_maintenance_all()
+        except Exception:
+            logger.exception("Scheduled maintenance failed")
+        time.sleep(_seconds_until_next_run(datetime.now()))
+
+
+def start_maintenance_thread() -> None:
+    """Run maintenance for every household now in the background, then again
+    after each local midnight."""
+    global _thread
+    with _start_lock:
+        if _thread is not None and _thread.is_alive():
+            return
+        _thread = threading.Thread(
+            target=_maintenance_loop, name="chores-maintenance", daemon=True
+        )
+        _thread.start()
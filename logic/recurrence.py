@@ -1,11 +1,38 @@
+from __future__ import annotations
+
 import json
-from datetime import date, timedelta
-from db.queries.chores import list_chores
-from db.queries.chore_instances import upsert_instances
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import Iterator
+from db.connection import unit_of_work
+from db.queries.chores import update_chore
+from db.queries.chore_instances import prune_unscheduled_instances
+
+
+def weekday_calendar(window_start: date, window_end: date) -> list[list[str]]:
+    """ISO dates in [window_start, window_end], bucketed by weekday (0 = Monday).
+
+    Each bucket is built by stepping 7 days from the first matching date, and is
+    sorted, so any chore's occurrences are a slice of the buckets it recurs on.
+    """
+    first, last = window_start.toordinal(), window_end.toordinal()
+    buckets = []
+    for weekday in range(7):
+        offset = (weekday - window_start.weekday()) % 7
+        buckets.append([
+            date.fromordinal(o).isoformat() for o in range(first + offset, last + 1, 7)
+        ])
+    return buckets
+
 
+def iter_chore_dates(
+    chore, window_start: date, window_end: date, calendar: list[list[str]] | None = None
+) -> Iterator[str]:
+    """Yield the ISO dates on which `chore` occurs within the window.
 
-def expand_chore(chore, window_start: date, window_end: date) -> list[dict]:
-    rows = []
+    `calendar` may be a weekday_calendar() covering the window; sharing one
+    across many chores avoids rebuilding the date strings for each of them.
+    """
     rec_type = chore["recurrence_type"]
     chore_start = date.fromisoformat(chore["start_date"])
     chore_end = date.fromisoformat(chore["end_date"]) if chore["end_date"] else None
@@ -14,33 +41,36 @@ def expand_chore(chore, window_start: date, window_end: date) -> list[dict]:
     effective_end = min(chore_end, window_end) if chore_end else window_end
 
     if effective_start > effective_end:
-        return rows
+        return
 
     if rec_type == "once":
-        d = chore_start
-        if window_start <= d <= window_end:
-            rows.append({"chore_id": chore["id"], "scheduled_date": d.isoformat()})
+        if window_start <= chore_start <= window_end:
+            yield chore_start.isoformat()
 
     elif rec_type in ("daily", "weekly"):
         raw_days = chore["recurrence_days"]
         if not raw_days:
-            return rows
-        allowed_days = set(json.loads(raw_days))
-        current = effective_start
-        while current <= effective_end:
-            if current.weekday() in allowed_days:
-                rows.append({
-                    "chore_id": chore["id"],
-                    "scheduled_date": current.isoformat(),
-                })
-            current += timedelta(days=1)
-
-    return rows
-
-
-def ensure_instances_for_window(window_start: date, window_end: date) -> None:
-    chores = list_chores(active_only=True)
-    all_rows = []
-    for chore in chores:
-        all_rows.extend(expand_chore(chore, window_start, window_end))
-    upsert_instances(all_rows)
+            return
+        if calendar is None:
+            calendar = weekday_calendar(effective_start, effective_end)
+        lo, hi = effective_start.isoformat(), effective_end.isoformat()
+        for weekday in sorted(set(json.loads(raw_days))):
+            bucket = calendar[weekday]
+            yield from bucket[bisect_left(bucket, lo):bisect_right(bucket, hi)]
+
+
+def reconcile_chore_schedule(chore_id: int, from_date: date) -> int:
+    """After a chore is edited, drop its persisted pending instances that no
+    longer fit the schedule; returns how many were removed.
+
+    Upcoming occurrences are computed at read time, so nothing is inserted.
+    """
+    return prune_unscheduled_instances(chore_id, from_date.isoformat())
+
+
+def edit_chore(chore_id: int, from_date: date, **fields) -> int:
+    """Save a chore edit and reconcile its pending instances in one transaction;
+    `fields` are update_chore's. Returns how many instances were removed."""
+    with unit_of_work():
+        update_chore(chore_id=chore_id, **fields)
+        return reconcile_chore_schedule(chore_id, from_date)
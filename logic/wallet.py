@@ -1,24 +1,68 @@
+from __future__ import annotations
+
+from db.connection import unit_of_work
 from db.queries.chore_instances import (
+    approve_instances,
     get_instance,
+    materialize_instance,
     transition_to_approved,
     transition_to_pending_approval,
     reset_to_pending,
 )
-from logic.allowance import credit_fixed_and_screen_time
+from db.queries.wallets import credit_wallet_many, get_balance_through, get_transactions_page
+from logic.allowance import credit_fixed_and_screen_time, fixed_and_screen_time_credits
 
 
 def mark_done_by_child(instance_id: int) -> bool:
     return transition_to_pending_approval(instance_id)
 
 
+def mark_occurrence_done(chore_id: int, scheduled_date: str) -> bool:
+    """Mark done an occurrence that has no instance row yet, persisting it first."""
+    with unit_of_work():
+        instance_id = materialize_instance(chore_id, scheduled_date)
+        return instance_id is not None and transition_to_pending_approval(instance_id)
+
+
 def approve_by_parent(instance_id: int) -> bool:
-    success = transition_to_approved(instance_id)
-    if success:
-        instance = get_instance(instance_id)
-        if instance:
-            credit_fixed_and_screen_time(instance)
+    with unit_of_work():
+        success = transition_to_approved(instance_id)
+        if success:
+            instance = get_instance(instance_id)
+            if instance:
+                credit_fixed_and_screen_time(instance)
     return success
 
 
+def approve_many(instance_ids: list[int]) -> int:
+    """Approve and credit a batch of instances in one transaction; returns how many."""
+    with unit_of_work():
+        approved = approve_instances(instance_ids)
+        credit_wallet_many([
+            credit for inst in approved for credit in fixed_and_screen_time_credits(inst)
+        ])
+    return len(approved)
+
+
 def reset_chore(instance_id: int) -> bool:
     return reset_to_pending(instance_id)
+
+
+def transaction_history_page(
+    child_id: int, cursor: tuple[str, int] | None = None, limit: int = 20
+) -> tuple[list[dict], tuple[str, int] | None]:
+    """One page of ledger rows with the balance after each; returns (rows, next_cursor).
+
+    next_cursor is None once the oldest transaction has been returned.
+    """
+    page = get_transactions_page(child_id, before=cursor, limit=limit)
+    rows = []
+    balance_after: dict[str, float] = {}
+    for tx in page:
+        tx_type = tx["transaction_type"]
+        if tx_type not in balance_after:
+            balance_after[tx_type] = get_balance_through(child_id, tx_type, tx["id"])
+        rows.append({**dict(tx), "balance_after": balance_after[tx_type]})
+        balance_after[tx_type] -= tx["amount"]
+    next_cursor = (page[-1]["created_at"], page[-1]["id"]) if len(page) == limit else None
+    return rows, next_cursor
@@ -1,8 +1,45 @@
 import streamlit as st
+from db.connection import HOUSEHOLDS_DIR, list_households
 from db.queries.children import list_children
 from logic.auth import verify_pin, logout
 
 
+def render_household_picker() -> str | None:
+    """Choose the household this session works in, when the app serves several.
+
+    Returns None when households are not configured. Switching household
+    clears the rest of the session, which belonged to the other household.
+    """
+    if not HOUSEHOLDS_DIR:
+        return None
+    households = list_households()
+    current = st.session_state.get("household")
+    if current not in households:
+        current = None
+
+    with st.sidebar:
+        if not households:
+            st.info("No households yet. Create one with `python -m db --household NAME migrate`.")
+            st.stop()
+        if current is not None and st.session_state.get("role") is not None:
+            st.caption(f"Household: **{current}**")
+            return current
+
+        choice = st.selectbox(
+            "Household",
+            households,
+            index=households.index(current) if current else None,
+            placeholder="Choose your family",
+        )
+        if choice is None:
+            st.stop()
+        if choice != current:
+            for key in list(st.session_state.keys()):
+                del st.session_state[key]
+            st.session_state["household"] = choice
+        return choice
+
+
 def render_auth_gate():
     if "role" not in st.session_state:
         st.session_state.role = None
@@ -1,15 +1,15 @@
 import streamlit as st
 import streamlit.components.v1 as components
 from datetime import date, timedelta
-from db.queries.chore_instances import get_instances_for_week, get_instances_for_date
-from logic.wallet import mark_done_by_child, reset_chore
-
-STATUS_COLOR = {
-    "pending": "🔘",
-    "completed_pending_approval": "🟡",
-    "approved": "🟢",
-    "missed": "🔴",
-}
+from db.connection import get_generation
+from db.queries.chore_instances import get_instances_for_week
+from logic.wallet import mark_done_by_child, mark_occurrence_done, reset_chore
+from ui.month_view import STATUS_COLOR, render_month_view
+from ui.render_timing import render_span
+
+# Weeks fetched either side of the one being viewed, so Prev/Next and day
+# navigation are served from memory until something is written.
+_PREFETCH_WEEKS = 2
 
 STATUS_LABEL = {
     "pending": "To Do",
@@ -28,7 +28,12 @@ def render_calendar(child_id: int):
         st.session_state.calendar_selected_date = date.today().isoformat()
 
     # Header nav
-    col_week, col_day = st.columns(2)
+    col_month, col_week, col_day = st.columns(3)
+    with col_month:
+        if st.button("Month View", use_container_width=True,
+                     type="primary" if st.session_state.calendar_view == "month" else "secondary"):
+            st.session_state.calendar_view = "month"
+            st.rerun()
     with col_week:
         if st.button("Week View", use_container_width=True,
                      type="primary" if st.session_state.calendar_view == "week" else "secondary"):
@@ -40,10 +45,46 @@ def render_calendar(child_id: int):
             st.session_state.calendar_view = "day"
             st.rerun()
 
-    if st.session_state.calendar_view == "week":
-        _render_week_view(child_id)
-    else:
-        _render_day_view(child_id)
+    with render_span(f"child/calendar/{st.session_state.calendar_view}"):
+        if st.session_state.calendar_view == "month":
+            render_month_view(child_id, key="child_calendar", on_select_day=_select_day)
+        elif st.session_state.calendar_view == "week":
+            _render_week_view(child_id)
+        else:
+            _render_day_view(child_id)
+
+
+def _select_day(day: date):
+    st.session_state.calendar_view = "day"
+    st.session_state.calendar_selected_date = day.isoformat()
+
+
+def _instances_by_date(child_id: int, start: date, end: date) -> dict[str, list]:
+    cache = st.session_state.get("_calendar_cache")
+    generation = get_generation()
+    if (
+        cache is None
+        or cache["child_id"] != child_id
+        or cache["generation"] != generation
+        or start < cache["start"]
+        or end > cache["end"]
+    ):
+        fetch_start = start - timedelta(weeks=_PREFETCH_WEEKS)
+        fetch_end = end + timedelta(weeks=_PREFETCH_WEEKS)
+        by_date: dict[str, list] = {}
+        for inst in get_instances_for_week(
+            fetch_start.isoformat(), fetch_end.isoformat(), child_id=child_id
+        ):
+            by_date.setdefault(inst["scheduled_date"], []).append(inst)
+        cache = {
+            "child_id": child_id,
+            "generation": generation,
+            "start": fetch_start,
+            "end": fetch_end,
+            "by_date": by_date,
+        }
+        st.session_state["_calendar_cache"] = cache
+    return cache["by_date"]
 
 
 def _render_week_view(child_id: int):
@@ -68,14 +109,7 @@ def _render_week_view(child_id: int):
             st.session_state.calendar_week_offset += 1
             st.rerun()
 
-    instances = get_instances_for_week(
-        week_start.isoformat(), week_end.isoformat(), child_id=child_id
-    )
-
-    # Group by date
-    by_date: dict[str, list] = {}
-    for inst in instances:
-        by_date.setdefault(inst["scheduled_date"], []).append(inst)
+    by_date = _instances_by_date(child_id, week_start, week_end)
 
     # Render 7 columns
     day_cols = st.columns(7)
@@ -159,7 +193,7 @@ def _render_day_view(child_id: int):
             st.session_state.calendar_selected_date = (selected + timedelta(days=1)).isoformat()
             st.rerun()
 
-    instances = get_instances_for_date(selected.isoformat(), child_id=child_id)
+    instances = _instances_by_date(child_id, selected, selected).get(selected.isoformat(), [])
 
     if not instances:
         st.info("No chores for this day.")
@@ -182,19 +216,24 @@ def _render_chore_card(inst, child_id: int, show_actions: bool = True):
                 st.caption(inst["description"])
             _render_allowance_chips(inst)
         with col2:
+            # Upcoming occurrences have no instance id until they are first marked.
+            card_key = f"{inst['chore_id']}_{inst['scheduled_date']}"
             if show_actions and status == "pending":
                 if st.button(
                     "Mark Done",
-                    key=f"done_{inst['id']}",
+                    key=f"done_{card_key}",
                     type="primary",
                     use_container_width=True,
                 ):
-                    mark_done_by_child(inst["id"])
+                    if inst["id"] is None:
+                        mark_occurrence_done(inst["chore_id"], inst["scheduled_date"])
+                    else:
+                        mark_done_by_child(inst["id"])
                     st.rerun()
             elif show_actions and status == "completed_pending_approval":
                 if st.button(
                     "Undo",
-                    key=f"undo_{inst['id']}",
+                    key=f"undo_{card_key}",
                     use_container_width=True,
                 ):
                     reset_chore(inst["id"])
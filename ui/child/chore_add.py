@@ -1,8 +1,7 @@
 import json
 import streamlit as st
-from datetime import date, timedelta
+from datetime import date
 from db.queries.chores import create_chore
-from logic.recurrence import ensure_instances_for_window
 
 DAYS_OF_WEEK = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
 DAY_MAP = {name: i for i, name in enumerate(DAYS_OF_WEEK)}
@@ -62,7 +61,5 @@ def render_chore_add(child_id: int):
                     screen_time_hours=0.0,
                 )
 
-                today = date.today()
-                ensure_instances_for_window(today, today + timedelta(days=30))
                 st.success(f"Chore '{title.strip()}' added!")
                 st.rerun()
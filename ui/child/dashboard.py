@@ -1,7 +1,7 @@
 import streamlit as st
-from datetime import date
+from datetime import date, timedelta
 from db.queries.children import get_child
-from db.queries.wallets import get_balance
+from db.queries.wallets import get_wallet_summaries
 from db.queries.chore_instances import get_instances_for_date
 from ui.child.calendar import render_calendar
 
@@ -15,13 +15,16 @@ def render_child_dashboard(child_id: int):
     st.title(f"Hi, {child['name']}!")
 
     # Wallet summary
+    today = date.today()
+    week_start = today - timedelta(days=today.weekday())
+    summary = get_wallet_summaries([child_id], week_start.isoformat())[child_id]
     col1, col2 = st.columns(2)
     with col1:
-        money = get_balance(child_id, "monetary")
-        st.metric("Money Earned", f"${money:.2f}")
+        st.metric("Money Earned", f"${summary['monetary']:.2f}")
     with col2:
-        screen = get_balance(child_id, "screen_time")
-        st.metric("Screen Time Banked", f"{screen:.0f} min")
+        st.metric("Screen Time Banked", f"{summary['screen_time']:.0f} min")
+    if summary["week_finalized"]:
+        st.caption("This week's weighted allowance has been paid out.")
 
     st.divider()
     render_calendar(child_id)
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import calendar
+import streamlit as st
+from datetime import date, timedelta
+from db.queries.chore_instances import get_status_counts_for_range
+
+DAYS_OF_WEEK = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+STATUS_COLOR = {
+    "pending": "🔘",
+    "completed_pending_approval": "🟡",
+    "approved": "🟢",
+    "missed": "🔴",
+}
+
+
+def render_month_view(child_id: int | None, key: str, on_select_day=None):
+    """Month grid of per-day status counts; `child_id=None` covers every child.
+
+    If `on_select_day` is given, each day gets a button that calls it with the
+    chosen date and reruns.
+    """
+    offset_key = f"{key}_month_offset"
+    if offset_key not in st.session_state:
+        st.session_state[offset_key] = 0
+
+    today = date.today()
+    year, month_index = divmod(today.year * 12 + today.month - 1 + st.session_state[offset_key], 12)
+    month_start = date(year, month_index + 1, 1)
+    month_end = date(year, month_index + 1, calendar.monthrange(year, month_index + 1)[1])
+
+    nav1, nav2, nav3 = st.columns([1, 4, 1])
+    with nav1:
+        if st.button("◀ Prev", use_container_width=True, key=f"{key}_month_prev"):
+            st.session_state[offset_key] -= 1
+            st.rerun()
+    with nav2:
+        st.markdown(
+            f"<h4 style='text-align:center'>{month_start.strftime('%B %Y')}</h4>",
+            unsafe_allow_html=True,
+        )
+    with nav3:
+        if st.button("Next ▶", use_container_width=True, key=f"{key}_month_next"):
+            st.session_state[offset_key] += 1
+            st.rerun()
+
+    grid_start = month_start - timedelta(days=month_start.weekday())
+    grid_end = month_end + timedelta(days=6 - month_end.weekday())
+
+    counts: dict[str, dict[str, int]] = {}
+    for row in get_status_counts_for_range(
+        grid_start.isoformat(), grid_end.isoformat(), child_id=child_id
+    ):
+        counts.setdefault(row["scheduled_date"], {})[row["status"]] = row["total"]
+
+    for col, name in zip(st.columns(7), DAYS_OF_WEEK):
+        with col:
+            st.markdown(f"**{name}**")
+
+    current = grid_start
+    while current <= grid_end:
+        for col in st.columns(7):
+            with col:
+                _render_day_cell(current, month_start.month, today, counts, key, on_select_day)
+            current += timedelta(days=1)
+
+
+def _render_day_cell(day: date, month: int, today: date, counts: dict, key: str, on_select_day):
+    if day.month != month:
+        st.caption("·")
+        return
+
+    day_str = day.isoformat()
+    label = day.strftime("%d")
+    if on_select_day is not None:
+        if st.button(
+            label,
+            key=f"{key}_month_day_{day_str}",
+            use_container_width=True,
+            type="primary" if day == today else "secondary",
+        ):
+            on_select_day(day)
+            st.rerun()
+    elif day == today:
+        st.markdown(f"**:blue[{label}]**")
+    else:
+        st.markdown(label)
+
+    day_counts = counts.get(day_str)
+    if day_counts:
+        st.caption(" ".join(
+            f"{emoji}{day_counts[status]}"
+            for status, emoji in STATUS_COLOR.items()
+            if status in day_counts
+        ))
+    else:
+        st.caption("—")
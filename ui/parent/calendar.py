@@ -0,0 +1,22 @@
+import streamlit as st
+from db.queries.children import list_children
+from ui.month_view import STATUS_COLOR, render_month_view
+
+STATUS_LABEL = {
+    "pending": "to do",
+    "completed_pending_approval": "waiting",
+    "approved": "approved",
+    "missed": "missed",
+}
+
+
+def render_parent_calendar():
+    st.header("Monthly Overview")
+
+    children = list_children()
+    child_options = {"All children": None}
+    child_options.update({c["name"]: c["id"] for c in children})
+    selected = st.selectbox("Child", options=list(child_options.keys()), key="parent_month_child")
+
+    st.caption(" | ".join(f"{STATUS_COLOR[s]} {label}" for s, label in STATUS_LABEL.items()))
+    render_month_view(child_options[selected], key="parent_calendar")
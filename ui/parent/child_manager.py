@@ -1,8 +1,10 @@
 import streamlit as st
 from datetime import date, timedelta
 from db.queries.children import list_children, create_child, update_child, delete_child
-from db.queries.wallets import get_balance, is_week_finalized
-from logic.allowance import finalize_week
+from db.queries.chore_instances import get_archived_week_rollups
+from db.queries.wallets import get_wallet_summaries
+from logic.allowance import finalize_week, finalize_week_all
+from ui.wallet_history import render_transaction_history
 
 
 def render_child_manager():
@@ -40,8 +42,21 @@ def render_child_manager():
     today = date.today()
     week_start = today - timedelta(days=today.weekday())
     week_end = week_start + timedelta(days=6)
+    summaries = get_wallet_summaries([c["id"] for c in children], week_start.isoformat())
+
+    if len(children) > 1 and not all(s["week_finalized"] for s in summaries.values()):
+        if st.button("Finalize This Week for All Children", key="finalize_all"):
+            results = finalize_week_all(week_start.isoformat())
+            paid = [r for r in results.values() if r["status"] == "finalized"]
+            if paid:
+                total = sum(r["total_payout"] for r in paid)
+                st.success(f"Finalized {len(paid)} children. Total payout: ${total:.2f}")
+                st.rerun()
+            else:
+                st.info("No approved weighted chores to pay out this week.")
 
     for child in children:
+        summary = summaries[child["id"]]
         with st.container(border=True):
             col_name, col_edit, col_del = st.columns([3, 1, 1])
             with col_name:
@@ -94,14 +109,11 @@ def render_child_manager():
                 with col_budget:
                     st.metric("Weekly Budget", f"${child['weekly_allowance_budget']:.2f}")
                 with col_money:
-                    bal = get_balance(child["id"], "monetary")
-                    st.metric("Money Earned", f"${bal:.2f}")
+                    st.metric("Money Earned", f"${summary['monetary']:.2f}")
                 with col_screen:
-                    screen = get_balance(child["id"], "screen_time")
-                    st.metric("Screen Time Banked", f"{screen:.0f} min")
+                    st.metric("Screen Time Banked", f"{summary['screen_time']:.0f} min")
 
-                already_finalized = is_week_finalized(child["id"], week_start.isoformat())
-                if already_finalized:
+                if summary["week_finalized"]:
                     st.caption(f"Week of {week_start.isoformat()} already finalized.")
                 else:
                     if st.button(
@@ -122,3 +134,16 @@ def render_child_manager():
                             st.info("No approved weighted chores this week.")
                         elif result["status"] == "zero_weight":
                             st.warning("All chore weights are zero — nothing to distribute.")
+
+                if st.toggle("Show transactions", key=f"tx_history_{child['id']}"):
+                    render_transaction_history(child["id"], key=f"parent_{child['id']}")
+
+                if st.toggle("Show archived history", key=f"archive_history_{child['id']}"):
+                    rollups = get_archived_week_rollups(child["id"])
+                    if not rollups:
+                        st.caption("No archived weeks yet.")
+                    for week in rollups:
+                        st.caption(
+                            f"Week of {week['week_start_date']}: "
+                            f"✅ {week['approved']} approved, ❌ {week['missed']} missed"
+                        )
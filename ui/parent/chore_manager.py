@@ -1,9 +1,9 @@
 import json
 import streamlit as st
 from datetime import date
-from db.queries.chores import list_chores, get_chore, create_chore, update_chore, deactivate_chore, prune_future_instances
+from db.queries.chores import list_chores, get_chore, create_chore, deactivate_chore, prune_future_instances
 from db.queries.children import list_children
-from logic.recurrence import ensure_instances_for_window
+from logic.recurrence import edit_chore
 
 DAYS_OF_WEEK = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
 DAY_MAP = {name: i for i, name in enumerate(DAYS_OF_WEEK)}
@@ -186,7 +186,7 @@ def _render_chore_form(chore):
                 assigned_to = child_options[selected_child_name]
 
                 if is_new:
-                    new_id = create_chore(
+                    create_chore(
                         title=form_title.strip(),
                         description=form_desc.strip() or None,
                         assigned_to=assigned_to,
@@ -201,8 +201,9 @@ def _render_chore_form(chore):
                         screen_time_hours=screen_time,
                     )
                 else:
-                    update_chore(
-                        chore_id=chore["id"],
+                    edit_chore(
+                        chore["id"],
+                        date.today(),
                         title=form_title.strip(),
                         description=form_desc.strip() or None,
                         assigned_to=assigned_to,
@@ -215,12 +216,6 @@ def _render_chore_form(chore):
                         chore_weight=chore_weight,
                         screen_time_hours=screen_time,
                     )
-                    if end_date:
-                        prune_future_instances(chore["id"], end_date.isoformat())
-
-                today = date.today()
-                from datetime import timedelta
-                ensure_instances_for_window(today, today + timedelta(days=30))
 
                 st.session_state.pop("chore_edit_id", None)
                 st.session_state.pop(_ASSIGN_KEY, None)
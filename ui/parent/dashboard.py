@@ -1,6 +1,6 @@
 import streamlit as st
 from db.queries.chore_instances import get_pending_approvals
-from logic.wallet import approve_by_parent, reset_chore
+from logic.wallet import approve_by_parent, approve_many, reset_chore
 
 STATUS_EMOJI = {
     "pending": "⬜",
@@ -25,8 +25,23 @@ def render_parent_dashboard():
         child_name = inst["child_name"] or "Unassigned"
         by_child.setdefault(child_name, []).append(inst)
 
+    if len(pending) > 1:
+        if st.button(f"Approve All ({len(pending)})", key="approve_all", type="primary"):
+            approve_many([inst["id"] for inst in pending])
+            st.rerun()
+
     for child_name, instances in by_child.items():
-        st.subheader(f"{child_name}")
+        col_name, col_all = st.columns([3, 1])
+        with col_name:
+            st.subheader(f"{child_name}")
+        with col_all:
+            if len(instances) > 1 and st.button(
+                f"Approve All for {child_name}",
+                key=f"approve_all_{child_name}",
+                use_container_width=True,
+            ):
+                approve_many([inst["id"] for inst in instances])
+                st.rerun()
         for inst in instances:
             with st.container(border=True):
                 col1, col2, col3 = st.columns([3, 1, 1])
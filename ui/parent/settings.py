@@ -1,5 +1,9 @@
 import streamlit as st
+from db.connection import is_profiling, set_profiling
+from ui.render_timing import clear_spans, spans_json, summarize_spans
+from db.queries.settings import set_setting
 from logic.auth import change_pin
+from logic.maintenance import ARCHIVE_AFTER_DAYS_KEY, archive_after_days
 
 
 def render_parent_settings():
@@ -23,3 +27,101 @@ def render_parent_settings():
                 st.success("PIN updated successfully.")
             else:
                 st.error("Current PIN is incorrect.")
+
+    st.divider()
+    st.subheader("Chore History")
+    with st.form("archive_settings_form"):
+        days = st.number_input(
+            "Archive settled chores older than (days)",
+            min_value=28,
+            step=7,
+            value=archive_after_days(),
+            help="Approved and missed chores older than this move to the archive "
+                 "overnight. They still show in calendars and history.",
+        )
+        if st.form_submit_button("Save"):
+            set_setting(ARCHIVE_AFTER_DAYS_KEY, str(int(days)))
+            st.success("Archive setting saved.")
+
+    st.divider()
+    _render_diagnostics()
+
+
+def _render_diagnostics():
+    st.subheader("Diagnostics")
+    _render_query_stats()
+    _render_render_times()
+
+
+def _render_query_stats():
+    enabled = st.toggle(
+        "Record SQL statements",
+        value=is_profiling(),
+        key="profile_sql",
+        help="Times every database statement. Leave off in normal use.",
+    )
+    if enabled != is_profiling():
+        set_profiling(enabled)
+        st.rerun()
+    if not enabled:
+        return
+
+    queries = st.session_state.get("_last_rerun_queries") or []
+    st.caption("Previous page load:")
+    col_count, col_time = st.columns(2)
+    with col_count:
+        st.metric("Queries", len(queries))
+    with col_time:
+        st.metric("DB time", f"{sum(q['ms'] for q in queries):.1f} ms")
+
+    slowest = sorted(queries, key=lambda q: q["ms"], reverse=True)[:10]
+    if slowest:
+        st.dataframe(
+            [
+                {
+                    "ms": round(q["ms"], 2),
+                    "Rows": q["rows"],
+                    "Function": q["caller"],
+                    "SQL": q["sql"],
+                }
+                for q in slowest
+            ],
+            hide_index=True,
+            use_container_width=True,
+        )
+
+
+def _render_render_times():
+    st.markdown("**Render times** (recent page loads, all sessions)")
+    summary = summarize_spans()
+    if not summary:
+        st.caption("Nothing recorded yet.")
+        return
+    st.dataframe(
+        [
+            {
+                "View": row["name"],
+                "Loads": row["count"],
+                "p50 ms": row["p50_ms"],
+                "p95 ms": row["p95_ms"],
+                "p50 elements": row["p50_elements"],
+                "p95 elements": row["p95_elements"],
+            }
+            for row in summary
+        ],
+        hide_index=True,
+        use_container_width=True,
+    )
+    col_dump, col_clear = st.columns(2)
+    with col_dump:
+        st.download_button(
+            "Download spans (JSON)",
+            data=spans_json(),
+            file_name="render_spans.json",
+            mime="application/json",
+            use_container_width=True,
+        )
+    with col_clear:
+        if st.button("Clear", key="clear_render_spans", use_container_width=True):
+            clear_spans()
+            st.rerun()
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import contextlib
+import functools
+import json
+import logging
+import math
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+import streamlit
+from streamlit.runtime.scriptrunner import ScriptRunContext, get_script_run_ctx
+
+logger = logging.getLogger(__name__)
+
+# Spans from every session in this process, newest last.
+_BUFFER_SIZE = 2000
+
+_spans: deque[dict] = deque(maxlen=_BUFFER_SIZE)
+_spans_lock = threading.Lock()
+
+
+# Element counting wraps ScriptRunContext._enqueue, which is not public API.
+# It has been checked against these Streamlit versions (inclusive); outside
+# them spans still record time, with "elements" left as None.
+_ELEMENT_COUNT_VERSIONS = ((1, 32), (1, 66))
+
+
+class _ElementCounter:
+    """Stands in for a session's message queue callback, counting the element
+    deltas that pass through it."""
+
+    def __init__(self, enqueue):
+        self._enqueue = enqueue
+        self.count = 0
+
+    def __call__(self, msg):
+        if msg.HasField("delta"):
+            self.count += 1
+        self._enqueue(msg)
+
+
+@functools.lru_cache(maxsize=None)
+def _element_counting_supported() -> bool:
+    """Whether this Streamlit is one element counting was checked against;
+    warns once when it is not."""
+    version = tuple(int(p) for p in re.findall(r"\d+", streamlit.__version__)[:2])
+    low, high = _ELEMENT_COUNT_VERSIONS
+    supported = (
+        low <= version <= high
+        and "_enqueue" in getattr(ScriptRunContext, "__dataclass_fields__", {})
+    )
+    if not supported:
+        logger.warning(
+            "Render spans will not count elements: Streamlit %s is outside the "
+            "checked versions %s.%s-%s.%s",
+            streamlit.__version__, *low, *high,
+        )
+    return supported
+
+
+def _element_counter() -> _ElementCounter | None:
+    if not _element_counting_supported():
+        return None
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return None
+    if not isinstance(ctx._enqueue, _ElementCounter):
+        ctx._enqueue = _ElementCounter(ctx._enqueue)
+    return ctx._enqueue
+
+
+@contextlib.contextmanager
+def render_span(name: str):
+    """Record the wall time and number of elements emitted inside the block.
+
+    Spans cut short by an exception, including st.rerun(), are not recorded.
+    """
+    counter = _element_counter()
+    first = counter.count if counter else 0
+    started = time.perf_counter()
+    yield
+    span = {
+        "name": name,
+        "ms": round((time.perf_counter() - started) * 1000, 3),
+        "elements": counter.count - first if counter else None,
+        "at": datetime.now().isoformat(timespec="seconds"),
+    }
+    with _spans_lock:
+        _spans.append(span)
+
+
+def recent_spans() -> list[dict]:
+    with _spans_lock:
+        return list(_spans)
+
+
+def clear_spans() -> None:
+    with _spans_lock:
+        _spans.clear()
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def summarize_spans(spans: list[dict] | None = None) -> list[dict]:
+    """p50 / p95 wall time and element count per span name, slowest p95 first."""
+    by_name: dict[str, list[dict]] = {}
+    for span in recent_spans() if spans is None else spans:
+        by_name.setdefault(span["name"], []).append(span)
+    summary = []
+    for name, group in by_name.items():
+        times = [s["ms"] for s in group]
+        elements = [s["elements"] for s in group if s["elements"] is not None]
+        summary.append({
+            "name": name,
+            "count": len(group),
+            "p50_ms": _percentile(times, 0.5),
+            "p95_ms": _percentile(times, 0.95),
+            "p50_elements": _percentile(elements, 0.5) if elements else None,
+            "p95_elements": _percentile(elements, 0.95) if elements else None,
+        })
+    return sorted(summary, key=lambda s: s["p95_ms"], reverse=True)
+
+
+def spans_json() -> str:
+    spans = recent_spans()
+    return json.dumps({"summary": summarize_spans(spans), "spans": spans}, indent=2)
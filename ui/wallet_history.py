@@ -0,0 +1,51 @@
+import streamlit as st
+from db.connection import get_generation
+from logic.wallet import transaction_history_page
+
+_PAGE_SIZE = 20
+
+
+def render_transaction_history(child_id: int, key: str):
+    """Newest-first ledger for a child, loaded a page at a time on request."""
+    state_key = f"{key}_tx_history"
+    state = st.session_state.get(state_key)
+    generation = get_generation()
+    if state is None or state["child_id"] != child_id or state["generation"] != generation:
+        rows, cursor = transaction_history_page(child_id, limit=_PAGE_SIZE)
+        state = {"child_id": child_id, "generation": generation, "rows": rows, "cursor": cursor}
+        st.session_state[state_key] = state
+
+    if not state["rows"]:
+        st.info("No transactions yet.")
+        return
+
+    st.dataframe(
+        [_format_row(tx) for tx in state["rows"]],
+        hide_index=True,
+        use_container_width=True,
+        height=min(420, 38 + 35 * len(state["rows"])),
+    )
+
+    if state["cursor"] is not None:
+        if st.button("Load older", key=f"{key}_tx_more"):
+            rows, cursor = transaction_history_page(
+                child_id, cursor=state["cursor"], limit=_PAGE_SIZE
+            )
+            state["rows"].extend(rows)
+            state["cursor"] = cursor
+            st.rerun()
+
+
+def _format_row(tx: dict) -> dict:
+    if tx["transaction_type"] == "monetary":
+        amount = f"${tx['amount']:.2f}"
+        balance = f"${tx['balance_after']:.2f}"
+    else:
+        amount = f"{tx['amount']:.0f} min"
+        balance = f"{tx['balance_after']:.0f} min"
+    return {
+        "Date": tx["created_at"][:10],
+        "For": tx["chore_title"] or tx["note"] or "",
+        "Amount": amount,
+        "Balance": balance,
+    }